@@ -32,6 +32,7 @@ from drivemindr.config import (
 )
 from drivemindr.database import Database
 from drivemindr.safety import SafetyEngine
+from drivemindr.utils import clamp
 
 logger = logging.getLogger("drivemindr.classifier")
 
@@ -178,6 +179,13 @@ def _build_batch_prompt(files: list[sqlite3.Row]) -> str:
     return "\n".join(lines)
 
 
+# Compiled once; _parse_response runs for every batch
+_FENCE_OPEN_RE = re.compile(r"^```(?:json)?\s*")
+_FENCE_CLOSE_RE = re.compile(r"\s*```$")
+_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r",\s*\]")
+
+
 def _parse_response(text: str, expected_count: int) -> list[ClassificationResult]:
     """Parse the AI's JSON response into ClassificationResult objects.
 
@@ -185,17 +193,17 @@ def _parse_response(text: str, expected_count: int) -> list[ClassificationResult
     """
     # Strip markdown code fences if present
     cleaned = text.strip()
-    cleaned = re.sub(r"^```(?:json)?\s*", "", cleaned)
-    cleaned = re.sub(r"\s*```$", "", cleaned)
+    cleaned = _FENCE_OPEN_RE.sub("", cleaned)
+    cleaned = _FENCE_CLOSE_RE.sub("", cleaned)
     cleaned = cleaned.strip()
 
     # Attempt to extract just the JSON array if there's surrounding text
-    match = re.search(r"\[.*\]", cleaned, re.DOTALL)
+    match = _ARRAY_RE.search(cleaned)
     if match:
         cleaned = match.group(0)
 
     # Remove trailing commas before ] (common LLM mistake)
-    cleaned = re.sub(r",\s*\]", "]", cleaned)
+    cleaned = _TRAILING_COMMA_RE.sub("]", cleaned)
 
     try:
         raw = json.loads(cleaned)
@@ -221,7 +229,7 @@ def _parse_response(text: str, expected_count: int) -> list[ClassificationResult
         confidence = item.get("confidence", 0.0)
         try:
             confidence = float(confidence)
-            confidence = max(0.0, min(1.0, confidence))
+            confidence = clamp(confidence)
         except (TypeError, ValueError):
             logger.warning("Invalid confidence '%s' — defaulting to 0.0", confidence)
             confidence = 0.0
@@ -391,9 +399,10 @@ class FileClassifier:
             result_map[r.path] = r
 
         stored: list[dict[str, Any]] = []
+        paths = [f["path"] for f in files]
+        results: list[ClassificationResult] = []
 
-        for f in files:
-            path = f["path"]
+        for path in paths:
             ai = result_map.get(path)
 
             if ai is None:
@@ -404,16 +413,18 @@ class FileClassifier:
                     reason="No AI classification returned", category="unknown",
                 )
                 self._errors += 1
+            results.append(ai)
+
+        # Run the batch through the safety engine — this is where overrides happen
+        verdicts = self.safety.check_many(
+            paths,
+            [ai.action for ai in results],
+            [ai.confidence for ai in results],
+            owners=[f["owner"] for f in files],
+            extensions=[f["extension"] for f in files],
+        )
 
-            # Run through safety engine — this is where overrides happen
-            verdict = self.safety.check(
-                file_path=path,
-                ai_action=ai.action,
-                ai_confidence=ai.confidence,
-                owner=f["owner"],
-                extension=f["extension"],
-            )
-
+        for f, path, ai, verdict in zip(files, paths, results, verdicts):
             if verdict.overridden:
                 self._overridden += 1
 
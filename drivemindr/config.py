@@ -72,6 +72,18 @@ logger = logging.getLogger("drivemindr")
 # Database
 # ---------------------------------------------------------------------------
 DEFAULT_DB_NAME: Final[str] = "drivemindr.db"
+# Bytes of the database file SQLite may memory-map for reads (0 disables).
+DB_MMAP_SIZE: Final[int] = int(os.environ.get("DRIVEMINDR_MMAP_SIZE", 256 * 1024 * 1024))
+
+# ---------------------------------------------------------------------------
+# Integrity checksums (undo log)
+# ---------------------------------------------------------------------------
+# BLAKE3 when the optional ``blake3`` package is installed, else SHA-256.
+# Stored values carry an algorithm tag ("b3:…" / "sha256:…").
+CHECKSUM_ALGORITHM: Final[str] = "blake3"
+# Threads hashing files ahead of execution; 0 = min(8, CPU count). Use 1 on
+# a spinning disk, where parallel reads only add seeks.
+CHECKSUM_WORKERS: Final[int] = int(os.environ.get("DRIVEMINDR_CHECKSUM_WORKERS", 0))
 
 # ---------------------------------------------------------------------------
 # Ollama (localhost only — NEVER changes)
@@ -126,7 +138,9 @@ PROTECTED_OWNERS: Final[list[str]] = [
 # ---------------------------------------------------------------------------
 # Document Guardian — file extensions that may NEVER be auto-deleted
 # ---------------------------------------------------------------------------
-DOCUMENT_EXTENSIONS: Final[frozenset[str]] = frozenset({
+# Members are interned so the scanner's interned suffixes are the very same
+# objects, letting set lookups succeed on identity.
+DOCUMENT_EXTENSIONS: Final[frozenset[str]] = frozenset(map(sys.intern, {
     # Text documents
     ".doc", ".docx", ".pdf", ".txt", ".md", ".rtf", ".odt", ".tex", ".pages",
     # Spreadsheets
@@ -135,25 +149,32 @@ DOCUMENT_EXTENSIONS: Final[frozenset[str]] = frozenset({
     ".ppt", ".pptx", ".odp", ".key",
     # eBooks
     ".epub", ".mobi",
-})
+}))
 
-PHOTO_VIDEO_EXTENSIONS: Final[frozenset[str]] = frozenset({
-    # Photos
+PHOTO_EXTENSIONS: Final[frozenset[str]] = frozenset(map(sys.intern, {
     ".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".tif",
     ".webp", ".svg", ".raw", ".cr2", ".nef", ".heic", ".heif",
-    # Videos
+}))
+
+VIDEO_EXTENSIONS: Final[frozenset[str]] = frozenset(map(sys.intern, {
     ".mp4", ".mov", ".avi", ".mkv", ".wmv", ".flv", ".webm", ".m4v",
-    # Audio
+}))
+
+AUDIO_EXTENSIONS: Final[frozenset[str]] = frozenset(map(sys.intern, {
     ".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma", ".m4a",
-})
+}))
+
+PHOTO_VIDEO_EXTENSIONS: Final[frozenset[str]] = (
+    PHOTO_EXTENSIONS | VIDEO_EXTENSIONS | AUDIO_EXTENSIONS
+)
 
-SOURCE_CODE_EXTENSIONS: Final[frozenset[str]] = frozenset({
+SOURCE_CODE_EXTENSIONS: Final[frozenset[str]] = frozenset(map(sys.intern, {
     ".py", ".js", ".ts", ".jsx", ".tsx", ".java", ".cpp", ".c", ".h",
     ".hpp", ".cs", ".go", ".rs", ".rb", ".php", ".swift", ".kt",
     ".scala", ".r", ".m", ".sql", ".sh", ".bash", ".ps1", ".bat",
     ".cmd", ".yaml", ".yml", ".json", ".xml", ".toml", ".ini", ".cfg",
     ".html", ".css", ".scss", ".less", ".vue", ".svelte",
-})
+}))
 
 SENSITIVE_FILE_PATTERNS: Final[list[str]] = [
     ".env",
@@ -174,7 +195,8 @@ SENSITIVE_FILE_PATTERNS: Final[list[str]] = [
     ".p12",
 ]
 
-# All extensions that the Document Guardian protects from deletion
+# All extensions that the Document Guardian protects from deletion.
+# Every set above is lower-case, so a lower-case suffix needs one hash probe.
 GUARDIAN_EXTENSIONS: Final[frozenset[str]] = (
     DOCUMENT_EXTENSIONS | PHOTO_VIDEO_EXTENSIONS | SOURCE_CODE_EXTENSIONS
 )
@@ -202,3 +224,6 @@ SCANNER_SKIP_DIRS: Final[frozenset[str]] = frozenset({
     "$WinREAgent",
     "$SysReset",
 })
+
+# Metadata rows per bulk upsert (one executemany in one transaction)
+SCANNER_BATCH_SIZE: Final[int] = 1000
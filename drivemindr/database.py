@@ -12,7 +12,7 @@ from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Generator
 
-from drivemindr.config import DEFAULT_DB_NAME
+from drivemindr.config import DB_MMAP_SIZE, DEFAULT_DB_NAME
 
 logger = logging.getLogger("drivemindr.database")
 
@@ -99,11 +99,69 @@ CREATE TABLE IF NOT EXISTS dir_sizes (
 );
 
 CREATE INDEX IF NOT EXISTS idx_files_path       ON files(path);
-CREATE INDEX IF NOT EXISTS idx_files_extension   ON files(extension);
+-- get_files(extension=...) filters on extension and orders by size: one
+-- index range scan, no sort. Supersedes the single-column idx_files_extension.
+DROP INDEX IF EXISTS idx_files_extension;
+CREATE INDEX IF NOT EXISTS idx_files_ext_size    ON files(extension, size_bytes DESC);
 CREATE INDEX IF NOT EXISTS idx_files_parent      ON files(parent_dir);
 CREATE INDEX IF NOT EXISTS idx_files_size        ON files(size_bytes DESC);
-CREATE INDEX IF NOT EXISTS idx_classifications_action ON classifications(action);
-CREATE INDEX IF NOT EXISTS idx_action_log_batch  ON action_log(batch_id);
+-- (action, file_id) covers the per-action filters and GROUP BY action
+-- joins without touching table rows; supersedes idx_classifications_action.
+DROP INDEX IF EXISTS idx_classifications_action;
+CREATE INDEX IF NOT EXISTS idx_classifications_action_file
+    ON classifications(action, file_id);
+-- Covering index for per-batch listings/aggregates (get_recent_batches,
+-- get_batch_actions); supersedes the old single-column idx_action_log_batch.
+DROP INDEX IF EXISTS idx_action_log_batch;
+CREATE INDEX IF NOT EXISTS idx_action_log_batch_cover
+    ON action_log(batch_id, id DESC, executed_at, undone);
+"""
+
+
+_UPSERT_FILE_SQL = """
+INSERT INTO files (path, name, extension, size_bytes, created, modified,
+                   accessed, owner, is_readonly, is_dir, parent_dir, scan_id)
+VALUES (:path, :name, :extension, :size_bytes, :created, :modified,
+        :accessed, :owner, :is_readonly, :is_dir, :parent_dir, :scan_id)
+ON CONFLICT(path) DO UPDATE SET
+    name=excluded.name, extension=excluded.extension,
+    size_bytes=excluded.size_bytes, created=excluded.created,
+    modified=excluded.modified, accessed=excluded.accessed,
+    owner=excluded.owner, is_readonly=excluded.is_readonly,
+    is_dir=excluded.is_dir, parent_dir=excluded.parent_dir,
+    scan_id=excluded.scan_id, scanned_at=datetime('now','localtime')
+"""
+
+# Approved actions in execution order: deletes, then moves, then archives;
+# largest files first within each.
+_APPROVED_FROM_SQL = """
+FROM files f
+JOIN classifications c ON c.file_id = f.id
+JOIN user_decisions ud ON ud.file_id = f.id
+WHERE ud.decision = 'APPROVE'
+ORDER BY
+    CASE COALESCE(ud.new_action, c.action)
+        WHEN 'DELETE_JUNK' THEN 1
+        WHEN 'DELETE_UNUSED' THEN 2
+        WHEN 'MOVE_DATA' THEN 3
+        WHEN 'MOVE_APP' THEN 4
+        WHEN 'ARCHIVE' THEN 5
+        ELSE 6
+    END,
+    f.size_bytes DESC
+"""
+
+# Re-run ANALYZE on ``files`` after this many rows arrive through
+# bulk_upsert_files, so the planner's join order tracks large scans.
+_ANALYZE_AFTER_ROWS = 10_000
+
+_UPSERT_DECISION_SQL = """
+INSERT INTO user_decisions (file_id, decision, new_action)
+VALUES (?, ?, ?)
+ON CONFLICT(file_id) DO UPDATE SET
+    decision=excluded.decision,
+    new_action=excluded.new_action,
+    decided_at=datetime('now','localtime')
 """
 
 
@@ -113,6 +171,7 @@ class Database:
     def __init__(self, db_path: str | Path | None = None) -> None:
         self.db_path = Path(db_path) if db_path else Path(DEFAULT_DB_NAME)
         self._conn: sqlite3.Connection | None = None
+        self._rows_since_analyze = 0
         logger.debug("Database configured at %s", self.db_path)
 
     # -- connection management ------------------------------------------------
@@ -120,20 +179,71 @@ class Database:
     def connect(self) -> None:
         """Open (or create) the database and ensure the schema exists."""
         logger.info("Opening database: %s", self.db_path)
-        self._conn = sqlite3.connect(str(self.db_path))
-        self._conn.row_factory = sqlite3.Row
-        self._conn.execute("PRAGMA journal_mode=WAL;")
-        self._conn.execute("PRAGMA foreign_keys=ON;")
+        # The scanner hands batches to a dedicated writer thread; access stays
+        # serialized (one writer at a time), so the same-thread check is relaxed.
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            cached_statements=256,  # keep hot INSERT/UPDATE statements prepared
+            isolation_level=None,  # transaction() issues its own BEGIN
+        )
+        self._configure()
         self._conn.executescript(_SCHEMA_SQL)
         self._conn.commit()
         logger.debug("Schema initialized")
 
+    @classmethod
+    def from_connection(
+        cls, conn: sqlite3.Connection, db_path: str | Path = ":memory:",
+    ) -> Database:
+        """Wrap an open connection whose schema already exists.
+
+        Used with ``sqlite3.Connection.backup`` to clone a prepared database
+        without re-running the schema DDL. Per-connection pragmas are applied
+        here since a backup copies pages, not connection settings.
+        """
+        database = cls(db_path)
+        database._conn = conn
+        database._configure()
+        return database
+
+    def _configure(self) -> None:
+        """Apply the row factory and per-connection pragmas."""
+        self._conn.row_factory = sqlite3.Row
+        # Autocommit at the driver level: the only transactions are the
+        # explicit ones opened by transaction(), never an implicit BEGIN.
+        self._conn.isolation_level = None
+        if not self.is_memory:
+            # WAL lets the dashboard read while the executor writes, and with
+            # synchronous=NORMAL a commit no longer fsyncs the main DB file.
+            mode = self._conn.execute("PRAGMA journal_mode=WAL;").fetchone()[0]
+            if mode.lower() != "wal":
+                # e.g. a network share without shared-memory support
+                logger.warning("WAL unavailable for %s — journal_mode=%s", self.db_path, mode)
+            self._conn.execute("PRAGMA synchronous=NORMAL;")
+            # Reads of the file come straight from the page cache, no read(2)
+            self._conn.execute(f"PRAGMA mmap_size={DB_MMAP_SIZE:d};")
+        self._conn.execute("PRAGMA busy_timeout=5000;")
+        self._conn.execute("PRAGMA temp_store=MEMORY;")
+        self._conn.execute("PRAGMA cache_size=-65536;")  # 64 MiB page cache
+        self._conn.execute("PRAGMA foreign_keys=ON;")
+
     def close(self) -> None:
         if self._conn:
+            try:
+                # Refreshes planner statistics only for tables that need it
+                self._conn.execute("PRAGMA optimize;")
+            except sqlite3.Error as exc:
+                logger.debug("PRAGMA optimize skipped: %s", exc)
             self._conn.close()
             self._conn = None
             logger.debug("Database connection closed")
 
+    @property
+    def is_memory(self) -> bool:
+        """True for a private in-memory database (no journal or fsync to tune)."""
+        return str(self.db_path) == ":memory:"
+
     @property
     def conn(self) -> sqlite3.Connection:
         if self._conn is None:
@@ -142,8 +252,31 @@ class Database:
 
     @contextmanager
     def transaction(self) -> Generator[sqlite3.Cursor, None, None]:
-        """Context manager that commits on success or rolls back on error."""
+        """Context manager that commits on success or rolls back on error.
+
+        Opens with ``BEGIN IMMEDIATE``: the write lock is taken at BEGIN, so
+        contention with another writer waits out ``busy_timeout`` up front
+        instead of failing with SQLITE_BUSY on a deferred lock upgrade
+        halfway through.
+
+        Inside an already-open transaction the block runs under a SAVEPOINT
+        instead: an error undoes only this block, and committing is left to
+        whoever opened the outer transaction.
+        """
         cur = self.conn.cursor()
+        if self.conn.in_transaction:
+            cur.execute("SAVEPOINT drivemindr_tx")
+            try:
+                yield cur
+            except Exception:
+                cur.execute("ROLLBACK TO drivemindr_tx")
+                cur.execute("RELEASE drivemindr_tx")
+                # No traceback here: whoever handles the error reports it
+                logger.debug("Savepoint rolled back")
+                raise
+            cur.execute("RELEASE drivemindr_tx")
+            return
+        cur.execute("BEGIN IMMEDIATE")
         try:
             yield cur
             self.conn.commit()
@@ -156,44 +289,27 @@ class Database:
 
     def upsert_file(self, metadata: dict[str, Any]) -> int:
         """Insert or update a file record. Returns the row id."""
-        sql = """
-        INSERT INTO files (path, name, extension, size_bytes, created, modified,
-                           accessed, owner, is_readonly, is_dir, parent_dir, scan_id)
-        VALUES (:path, :name, :extension, :size_bytes, :created, :modified,
-                :accessed, :owner, :is_readonly, :is_dir, :parent_dir, :scan_id)
-        ON CONFLICT(path) DO UPDATE SET
-            name=excluded.name, extension=excluded.extension,
-            size_bytes=excluded.size_bytes, created=excluded.created,
-            modified=excluded.modified, accessed=excluded.accessed,
-            owner=excluded.owner, is_readonly=excluded.is_readonly,
-            is_dir=excluded.is_dir, parent_dir=excluded.parent_dir,
-            scan_id=excluded.scan_id, scanned_at=datetime('now','localtime')
-        """
         with self.transaction() as cur:
-            cur.execute(sql, metadata)
+            cur.execute(_UPSERT_FILE_SQL, metadata)
             row_id = cur.lastrowid
         logger.debug("Upserted file id=%s path=%s", row_id, metadata.get("path"))
         return row_id  # type: ignore[return-value]
 
     def bulk_upsert_files(self, records: list[dict[str, Any]]) -> int:
-        """Bulk insert/update file records. Returns count inserted."""
-        sql = """
-        INSERT INTO files (path, name, extension, size_bytes, created, modified,
-                           accessed, owner, is_readonly, is_dir, parent_dir, scan_id)
-        VALUES (:path, :name, :extension, :size_bytes, :created, :modified,
-                :accessed, :owner, :is_readonly, :is_dir, :parent_dir, :scan_id)
-        ON CONFLICT(path) DO UPDATE SET
-            name=excluded.name, extension=excluded.extension,
-            size_bytes=excluded.size_bytes, created=excluded.created,
-            modified=excluded.modified, accessed=excluded.accessed,
-            owner=excluded.owner, is_readonly=excluded.is_readonly,
-            is_dir=excluded.is_dir, parent_dir=excluded.parent_dir,
-            scan_id=excluded.scan_id, scanned_at=datetime('now','localtime')
+        """Bulk insert/update file records. Returns count inserted.
+
+        One prepared statement via ``executemany`` in a single transaction.
+        Every ``_ANALYZE_AFTER_ROWS`` rows the ``files`` statistics are rebuilt.
         """
         with self.transaction() as cur:
-            cur.executemany(sql, records)
+            cur.executemany(_UPSERT_FILE_SQL, records)
             count = cur.rowcount
         logger.info("Bulk upserted %d file records", count)
+        self._rows_since_analyze += count
+        if self._rows_since_analyze >= _ANALYZE_AFTER_ROWS:
+            self.conn.execute("ANALYZE files;")
+            self._rows_since_analyze = 0
+            logger.debug("Refreshed planner statistics for files")
         return count
 
     def upsert_dir_size(self, path: str, total_bytes: int, file_count: int, scan_id: str) -> None:
@@ -208,6 +324,29 @@ class Database:
         with self.transaction() as cur:
             cur.execute(sql, (path, total_bytes, file_count, scan_id))
 
+    def aggregate_dir_sizes(self, scan_id: str) -> int:
+        """Rebuild ``dir_sizes`` for *scan_id* from the ``files`` table in one pass.
+
+        Sums file sizes per ``parent_dir`` inside SQLite rather than
+        accumulating them in Python during the walk. Returns rows written.
+        """
+        sql = """
+        INSERT INTO dir_sizes (path, total_bytes, file_count, scan_id)
+        SELECT parent_dir, SUM(size_bytes), COUNT(*), scan_id
+        FROM files
+        WHERE scan_id = ? AND is_dir = 0 AND parent_dir IS NOT NULL
+        GROUP BY parent_dir
+        ON CONFLICT(path) DO UPDATE SET
+            total_bytes=excluded.total_bytes,
+            file_count=excluded.file_count,
+            scan_id=excluded.scan_id
+        """
+        with self.transaction() as cur:
+            cur.execute(sql, (scan_id,))
+            count = cur.rowcount
+        logger.info("Aggregated sizes for %d directories", count)
+        return count
+
     def upsert_installed_app(self, app: dict[str, Any]) -> None:
         sql = """
         INSERT INTO installed_apps
@@ -270,6 +409,8 @@ class Database:
         ).fetchall()
 
     def file_count(self) -> int:
+        # COUNT(*) already scans the narrowest index (idx_files_size);
+        # COUNT(path) would walk the larger text index instead.
         row = self.conn.execute("SELECT COUNT(*) FROM files").fetchone()
         return row[0] if row else 0
 
@@ -340,24 +481,24 @@ class Database:
 
     def get_approved_actions(self) -> list[sqlite3.Row]:
         """Return files approved for execution (user decision = APPROVE)."""
-        sql = """
+        sql = f"""
         SELECT f.*, c.action AS ai_action, c.confidence,
                ud.decision, ud.new_action,
                COALESCE(ud.new_action, c.action) AS final_action
-        FROM files f
-        JOIN classifications c ON c.file_id = f.id
-        JOIN user_decisions ud ON ud.file_id = f.id
-        WHERE ud.decision = 'APPROVE'
-        ORDER BY
-            CASE COALESCE(ud.new_action, c.action)
-                WHEN 'DELETE_JUNK' THEN 1
-                WHEN 'DELETE_UNUSED' THEN 2
-                WHEN 'MOVE_DATA' THEN 3
-                WHEN 'MOVE_APP' THEN 4
-                WHEN 'ARCHIVE' THEN 5
-                ELSE 6
-            END,
-            f.size_bytes DESC
+        {_APPROVED_FROM_SQL}
+        """
+        return self.conn.execute(sql).fetchall()
+
+    def get_execution_plan(self) -> list[sqlite3.Row]:
+        """Approved actions with only the columns the executor needs.
+
+        Same rows and order as :meth:`get_approved_actions`, without the
+        full file record and review columns.
+        """
+        sql = f"""
+        SELECT f.id, f.path, f.extension,
+               COALESCE(ud.new_action, c.action) AS final_action
+        {_APPROVED_FROM_SQL}
         """
         return self.conn.execute(sql).fetchall()
 
@@ -365,47 +506,39 @@ class Database:
         self, file_id: int, decision: str, new_action: str | None = None,
     ) -> None:
         """Store a user decision (APPROVE, REJECT, CHANGE, PROTECT)."""
-        sql = """
-        INSERT INTO user_decisions (file_id, decision, new_action)
-        VALUES (?, ?, ?)
-        ON CONFLICT(file_id) DO UPDATE SET
-            decision=excluded.decision,
-            new_action=excluded.new_action,
-            decided_at=datetime('now','localtime')
+        self.save_user_decisions([(file_id, decision, new_action)])
+
+    def save_user_decisions(
+        self, decisions: list[tuple[int, str, str | None]],
+    ) -> int:
+        """Store ``(file_id, decision, new_action)`` rows in one transaction.
+
+        Returns count saved.
         """
         with self.transaction() as cur:
-            cur.execute(sql, (file_id, decision, new_action))
+            cur.executemany(_UPSERT_DECISION_SQL, decisions)
+            return cur.rowcount
 
     def save_batch_decisions(
         self, file_ids: list[int], decision: str, new_action: str | None = None,
     ) -> int:
         """Store the same decision for multiple files. Returns count saved."""
-        sql = """
-        INSERT INTO user_decisions (file_id, decision, new_action)
-        VALUES (?, ?, ?)
-        ON CONFLICT(file_id) DO UPDATE SET
-            decision=excluded.decision,
-            new_action=excluded.new_action,
-            decided_at=datetime('now','localtime')
-        """
-        with self.transaction() as cur:
-            cur.executemany(sql, [(fid, decision, new_action) for fid in file_ids])
-            return cur.rowcount
+        return self.save_user_decisions([(fid, decision, new_action) for fid in file_ids])
 
     def get_review_stats(self) -> dict[str, int]:
         """Return counts of classified, reviewed, and approved files."""
         classified = self.conn.execute(
             "SELECT COUNT(*) FROM classifications"
         ).fetchone()[0]
-        reviewed = self.conn.execute(
-            "SELECT COUNT(*) FROM user_decisions"
-        ).fetchone()[0]
-        approved = self.conn.execute(
-            "SELECT COUNT(*) FROM user_decisions WHERE decision = 'APPROVE'"
-        ).fetchone()[0]
-        rejected = self.conn.execute(
-            "SELECT COUNT(*) FROM user_decisions WHERE decision = 'REJECT'"
-        ).fetchone()[0]
+        # One pass over user_decisions for all three decision counts
+        reviewed, approved, rejected = self.conn.execute(
+            """
+            SELECT COUNT(*),
+                   COALESCE(SUM(decision = 'APPROVE'), 0),
+                   COALESCE(SUM(decision = 'REJECT'), 0)
+            FROM user_decisions
+            """
+        ).fetchone()
         return {
             "classified": classified,
             "reviewed": reviewed,
@@ -9,7 +9,7 @@ Reads approved actions from the database and executes them:
 Every operation is:
   1. Checksummed before execution
   2. Logged to the undo system
-  3. Verified after execution (for moves)
+  3. Verified after execution (for moves that copy across volumes)
   4. Skippable via --dry-run
 
 Nothing is permanently deleted — "delete" operations move files to a
@@ -19,50 +19,94 @@ DriveMindr trash directory so they can be restored via undo.
 from __future__ import annotations
 
 import logging
-import shutil
+import os
 import zipfile
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 from drivemindr.config import (
+    AUDIO_EXTENSIONS,
+    CHECKSUM_ALGORITHM,
+    CHECKSUM_WORKERS,
     D_DRIVE_STRUCTURE,
     DOCUMENT_EXTENSIONS,
-    PHOTO_VIDEO_EXTENSIONS,
+    PHOTO_EXTENSIONS,
     SOURCE_CODE_EXTENSIONS,
+    VIDEO_EXTENSIONS,
 )
 from drivemindr.database import Database
 from drivemindr.symlinks import AppMigrator
-from drivemindr.undo import UndoManager, file_checksum
+from drivemindr.undo import UndoManager, fast_move, tagged_checksum
 
 logger = logging.getLogger("drivemindr.executor")
 
+# Undo-log rows are committed before each file is touched (write-ahead), so
+# a crash never leaves a moved file unlogged. Only the post-move
+# checksum_after values are buffered, and written once this many accumulate
+# (and at the end of the batch).
+_CHECKSUM_FLUSH_ROWS = 500
+
+# Actions whose source files get a checksum_before in the undo log
+_CHECKSUMMED_ACTIONS = frozenset({
+    "MOVE_DATA", "MOVE_APP", "DELETE_JUNK", "DELETE_UNUSED", "ARCHIVE",
+})
+
+# Archives hold cold data: deflate level 1 runs several times faster than
+# the default 6 for a few percent more output. Formats that are already
+# compressed are stored as-is, since deflating them only burns CPU.
+_ZIP_COMPRESSLEVEL = 1
+_PRECOMPRESSED_EXTENSIONS = frozenset({
+    ".zip", ".7z", ".rar", ".gz", ".bz2", ".xz", ".zst", ".cab",
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic", ".heif",
+    ".mp4", ".mov", ".avi", ".mkv", ".wmv", ".flv", ".webm", ".m4v",
+    ".mp3", ".aac", ".ogg", ".wma", ".m4a", ".flac",
+    ".docx", ".xlsx", ".pptx", ".odt", ".ods", ".odp", ".epub",
+})
+
+
+def _build_ext_category() -> dict[str, str]:
+    """Extension → D_DRIVE_STRUCTURE key; the first set listed wins a tie."""
+    mapping: dict[str, str] = {}
+    for ext in DOCUMENT_EXTENSIONS:
+        mapping.setdefault(ext, "documents")
+    for ext in AUDIO_EXTENSIONS:
+        mapping.setdefault(ext, "media_music")
+    for ext in VIDEO_EXTENSIONS:
+        mapping.setdefault(ext, "media_videos")
+    for ext in PHOTO_EXTENSIONS:
+        mapping.setdefault(ext, "media_photos")
+    for ext in SOURCE_CODE_EXTENSIONS:
+        mapping.setdefault(ext, "projects")
+    return mapping
+
+
+_EXT_CATEGORY: dict[str, str] = _build_ext_category()
+
 
 def _categorize_destination(path: str, extension: str) -> str:
     """Determine the D: drive destination category for a file.
 
     Maps file metadata to the appropriate D_DRIVE_STRUCTURE key.
     """
-    ext = extension.lower() if extension else ""
-    path_lower = path.lower()
-
-    if ext in DOCUMENT_EXTENSIONS:
-        return "documents"
-    if ext in PHOTO_VIDEO_EXTENSIONS:
-        # Subcategorize photos/videos/music
-        if ext in {".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma", ".m4a"}:
-            return "media_music"
-        if ext in {".mp4", ".mov", ".avi", ".mkv", ".wmv", ".flv", ".webm", ".m4v"}:
-            return "media_videos"
-        return "media_photos"
-    if ext in SOURCE_CODE_EXTENSIONS:
-        return "projects"
+    category = _EXT_CATEGORY.get(extension.lower() if extension else "")
+    if category is not None:
+        return category
     # Check path hints
+    path_lower = path.lower()
     if "project" in path_lower or "repos" in path_lower or "github" in path_lower:
         return "projects"
     return "documents"  # safe default
 
 
+def _zip_write(zf: zipfile.ZipFile, path: Path, arcname: str) -> None:
+    """Add *path* to *zf*, storing already-compressed formats uncompressed."""
+    if path.suffix.lower() in _PRECOMPRESSED_EXTENSIONS:
+        zf.write(path, arcname, compress_type=zipfile.ZIP_STORED)
+    else:
+        zf.write(path, arcname)
+
+
 def _compute_dest_path(source_path: str, category: str) -> Path:
     """Compute the destination path on D:, preserving subfolder structure.
 
@@ -107,8 +151,12 @@ class ExecutionEngine:
         undo: UndoManager | None = None,
         app_migrator: AppMigrator | None = None,
         trash_dir: Path | None = None,
+        checksum_algorithm: str = CHECKSUM_ALGORITHM,
+        checksum_workers: int = CHECKSUM_WORKERS,
     ) -> None:
         self.db = db
+        self.checksum_algorithm = checksum_algorithm
+        self.checksum_workers = checksum_workers
         self._trash_dir = trash_dir or Path(r"D:\DriveMindr\trash")
         self.undo = undo or UndoManager(db, trash_dir=self._trash_dir)
         self.app_migrator = app_migrator or AppMigrator(self.undo)
@@ -119,6 +167,14 @@ class ExecutionEngine:
         self._symlinked = 0
         self._skipped = 0
         self._errors = 0
+        # (checksum_after, log_id) pairs awaiting one batched UPDATE
+        self._pending_checksums: list[tuple[str, int]] = []
+        # checksum_before values hashed up front for the whole batch
+        self._prefetched: dict[Path, str | None] = {}
+        # Names present/claimed in each archive folder (os.path.normcase'd)
+        self._archive_names: dict[str, set[str]] = {}
+        # (file_id, source) pairs queued for one concurrent move to trash
+        self._pending_deletes: list[tuple[int, Path]] = []
 
     def execute_plan(
         self,
@@ -135,7 +191,7 @@ class ExecutionEngine:
         Returns:
             Summary dict with operation counts and batch_id.
         """
-        approved = self.db.get_approved_actions()
+        approved = self.db.get_execution_plan()
         if not approved:
             logger.info("No approved actions to execute.")
             return self._summary(batch_id=None)
@@ -146,37 +202,54 @@ class ExecutionEngine:
             len(approved), batch_id, " (DRY RUN)" if dry_run else "",
         )
 
-        for row in approved:
-            file_id = row["id"]
-            action = row["final_action"]
-            source_path = row["path"]
-            extension = row["extension"]
+        if not dry_run:
+            self._prefetch_checksums(approved)
 
-            try:
-                if action in ("MOVE_DATA", "MOVE_APP"):
-                    self._execute_move(
-                        file_id, source_path, extension, action,
-                        batch_id, dry_run=dry_run,
-                    )
-                elif action in ("DELETE_JUNK", "DELETE_UNUSED"):
-                    self._execute_delete(
-                        file_id, source_path, batch_id, dry_run=dry_run,
-                    )
-                elif action == "ARCHIVE":
-                    self._execute_archive(
-                        file_id, source_path, batch_id, dry_run=dry_run,
+        try:
+            for row in approved:
+                file_id = row["id"]
+                action = row["final_action"]
+                source_path = row["path"]
+                extension = row["extension"]
+
+                try:
+                    if action in ("MOVE_DATA", "MOVE_APP"):
+                        self._execute_move(
+                            file_id, source_path, extension, action,
+                            batch_id, dry_run=dry_run,
+                        )
+                    elif action in ("DELETE_JUNK", "DELETE_UNUSED"):
+                        self._execute_delete(
+                            file_id, source_path, batch_id, dry_run=dry_run,
+                        )
+                    elif action == "ARCHIVE":
+                        self._execute_archive(
+                            file_id, source_path, batch_id, dry_run=dry_run,
+                        )
+                    else:
+                        logger.debug("Skipping action %s for %s", action, source_path)
+                        self._skipped += 1
+                except Exception:
+                    logger.exception("Error executing %s on %s", action, source_path)
+                    self._errors += 1
+
+                if progress_callback:
+                    progress_callback(
+                        self._moved, self._deleted, self._archived, self._errors,
                     )
-                else:
-                    logger.debug("Skipping action %s for %s", action, source_path)
-                    self._skipped += 1
-            except Exception:
-                logger.exception("Error executing %s on %s", action, source_path)
-                self._errors += 1
 
-            if progress_callback:
-                progress_callback(
-                    self._moved, self._deleted, self._archived, self._errors,
-                )
+            if self._pending_deletes:
+                self._flush_deletes(batch_id)
+                if progress_callback:
+                    progress_callback(
+                        self._moved, self._deleted, self._archived, self._errors,
+                    )
+        finally:
+            # Undo rows are already committed; this only records the
+            # verification checksums of files moved so far.
+            self._flush_checksums()
+            # Deletes still queued were never moved; drop them.
+            self._pending_deletes = []
 
         summary = self._summary(batch_id=batch_id)
         logger.info("Execution complete: %s", summary)
@@ -193,6 +266,87 @@ class ExecutionEngine:
             "errors": self._errors,
         }
 
+    def _checksum(self, path: Path) -> str | None:
+        return tagged_checksum(path, self.checksum_algorithm)
+
+    def _checksum_before(self, src: Path) -> str | None:
+        """Pre-operation checksum, from the batch prefetch when available."""
+        if src in self._prefetched:
+            return self._prefetched.pop(src)
+        return self._checksum(src) if src.is_file() else None
+
+    def _prefetch_checksums(self, approved: list[Any]) -> None:
+        """Hash every source file of the batch concurrently before executing."""
+        paths = [
+            p for p in (
+                Path(row["path"]) for row in approved
+                if row["final_action"] in _CHECKSUMMED_ACTIONS
+            )
+            if p.is_file()
+        ]
+        self._prefetched = self.undo.checksum_many(
+            paths, algorithm=self.checksum_algorithm, max_workers=self.checksum_workers,
+        )
+
+    def _free_archive_path(self, archive_dir: Path, stem: str) -> Path:
+        """First unused ``<stem>[_N].zip`` in *archive_dir*, reserved for this run.
+
+        The folder is listed once with ``os.scandir``; later collisions are
+        resolved against that set instead of a ``stat`` per candidate.
+        """
+        key = os.fspath(archive_dir)
+        taken = self._archive_names.get(key)
+        if taken is None:
+            try:
+                with os.scandir(key) as it:
+                    taken = {os.path.normcase(e.name) for e in it}
+            except FileNotFoundError:
+                taken = set()
+            self._archive_names[key] = taken
+
+        name = f"{stem}.zip"
+        counter = 1
+        while os.path.normcase(name) in taken:
+            name = f"{stem}_{counter}.zip"
+            counter += 1
+        taken.add(os.path.normcase(name))
+        return archive_dir / name
+
+    # -- undo logging ----------------------------------------------------------
+
+    def _log_intent(
+        self,
+        file_id: int,
+        action: str,
+        source_path: str,
+        dest_path: str,
+        batch_id: str,
+        checksum_before: str | None = None,
+    ) -> int:
+        """Commit the undo-log row for an operation about to run. Returns its id.
+
+        Written ahead of the operation: if the process dies mid-operation the
+        row already exists, and undo skips rows whose destination never
+        appeared. Callers discard the row if the operation fails.
+        """
+        return self.undo.log_action(
+            file_id, action, source_path, dest_path, batch_id, checksum_before,
+        )
+
+    def _record_checksum(self, log_id: int, checksum_after: str | None) -> None:
+        """Queue a verified checksum_after; written by :meth:`_flush_checksums`."""
+        if checksum_after is None:
+            return
+        self._pending_checksums.append((checksum_after, log_id))
+        if len(self._pending_checksums) >= _CHECKSUM_FLUSH_ROWS:
+            self._flush_checksums()
+
+    def _flush_checksums(self) -> None:
+        """Write all queued checksum_after values in a single transaction."""
+        if self._pending_checksums:
+            self.undo.set_checksums_after(self._pending_checksums)
+            self._pending_checksums = []
+
     # -- individual operations -------------------------------------------------
 
     def _execute_move(
@@ -209,7 +363,7 @@ class ExecutionEngine:
         src = Path(source_path)
 
         if action == "MOVE_APP" and src.is_dir():
-            # App migration uses symlinks
+            # App migration uses symlinks and logs directly
             result = self.app_migrator.migrate_app(
                 src, file_id=file_id, batch_id=batch_id, dry_run=dry_run,
             )
@@ -233,34 +387,37 @@ class ExecutionEngine:
             return
 
         # Checksum before
-        checksum_before = file_checksum(src) if src.is_file() else None
-
-        # Move
-        dest.parent.mkdir(parents=True, exist_ok=True)
-        shutil.move(str(src), str(dest))
+        checksum_before = self._checksum_before(src)
 
-        # Checksum after (verify integrity)
-        checksum_after = file_checksum(dest) if dest.is_file() else None
+        # Log for undo, then move
+        self.undo.ensure_dir(dest.parent)
+        log_id = self._log_intent(
+            file_id, "MOVED", source_path, str(dest), batch_id, checksum_before,
+        )
+        try:
+            renamed = fast_move(src, dest)
+        except OSError:
+            self.undo.discard_actions([log_id])
+            raise
+
+        # Checksum after (verify integrity). A same-volume rename moves no
+        # bytes, so only a cross-volume copy needs the second full read.
+        if renamed:
+            checksum_after = checksum_before
+        else:
+            checksum_after = self._checksum(dest) if dest.is_file() else None
         if checksum_before and checksum_after and checksum_before != checksum_after:
             logger.error(
                 "Checksum mismatch after move! %s: %s != %s",
                 source_path, checksum_before, checksum_after,
             )
             # Rollback this one move
-            shutil.move(str(dest), str(src))
+            fast_move(dest, src)
+            self.undo.discard_actions([log_id])
             self._errors += 1
             return
 
-        # Log for undo
-        self.undo.log_action(
-            file_id=file_id,
-            action="MOVED",
-            source_path=source_path,
-            dest_path=str(dest),
-            batch_id=batch_id,
-            checksum_before=checksum_before,
-            checksum_after=checksum_after,
-        )
+        self._record_checksum(log_id, checksum_after)
         self._moved += 1
         logger.info("Moved: %s -> %s", src, dest)
 
@@ -275,11 +432,13 @@ class ExecutionEngine:
         """'Delete' a file by moving it to the DriveMindr trash.
 
         Files are NEVER permanently deleted — they go to trash so undo works.
+        The move itself is queued and done with the rest of the batch's
+        deletes in :meth:`_flush_deletes`.
         """
         src = Path(source_path)
-        trash_dest = self.undo.get_trash_path(src, batch_id)
 
         if dry_run:
+            trash_dest = self.undo.get_trash_path(src, batch_id)
             logger.info("DRY RUN — delete (to trash): %s -> %s", src, trash_dest)
             self._deleted += 1
             return
@@ -289,24 +448,17 @@ class ExecutionEngine:
             self._skipped += 1
             return
 
-        # Checksum before
-        checksum_before = file_checksum(src) if src.is_file() else None
-
-        # Move to trash
-        trash_dest.parent.mkdir(parents=True, exist_ok=True)
-        shutil.move(str(src), str(trash_dest))
-
-        # Log for undo
-        self.undo.log_action(
-            file_id=file_id,
-            action="DELETED",
-            source_path=source_path,
-            dest_path=str(trash_dest),
-            batch_id=batch_id,
-            checksum_before=checksum_before,
-        )
-        self._deleted += 1
-        logger.info("Deleted (to trash): %s -> %s", src, trash_dest)
+        self._pending_deletes.append((file_id, src))
+
+    def _flush_deletes(self, batch_id: str) -> None:
+        """Move every queued delete to trash concurrently and log them."""
+        items, self._pending_deletes = self._pending_deletes, []
+        checksums = {src: self._checksum_before(src) for _, src in items}
+        moved = self.undo.delete_many_to_trash(items, batch_id, checksums=checksums)
+        self._deleted += len(moved)
+        self._errors += len(items) - len(moved)
+        for _, src, trash_dest in moved:
+            logger.info("Deleted (to trash): %s -> %s", src, trash_dest)
 
     def _execute_archive(
         self,
@@ -334,38 +486,35 @@ class ExecutionEngine:
             return
 
         # Checksum before
-        checksum_before = file_checksum(src) if src.is_file() else None
+        checksum_before = self._checksum_before(src)
 
         # Create archive
-        archive_dir.mkdir(parents=True, exist_ok=True)
+        self.undo.ensure_dir(archive_dir)
 
         # Handle name collisions
-        counter = 1
-        while archive_path.exists():
-            archive_path = archive_dir / f"{src.stem}_{counter}.zip"
-            counter += 1
+        archive_path = self._free_archive_path(archive_dir, src.stem)
 
+        # Log for undo before writing (keep originals — archive is additive)
+        log_id = self._log_intent(
+            file_id, "ARCHIVED", source_path, str(archive_path), batch_id,
+            checksum_before,
+        )
         try:
-            with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            with zipfile.ZipFile(
+                archive_path, "w", zipfile.ZIP_DEFLATED,
+                compresslevel=_ZIP_COMPRESSLEVEL,
+            ) as zf:
                 if src.is_file():
-                    zf.write(str(src), src.name)
+                    _zip_write(zf, src, src.name)
                 elif src.is_dir():
                     for fp in src.rglob("*"):
                         if fp.is_file():
-                            zf.write(str(fp), str(fp.relative_to(src.parent)))
+                            _zip_write(zf, fp, str(fp.relative_to(src.parent)))
         except (OSError, zipfile.BadZipFile) as exc:
             logger.error("Archive creation failed for %s: %s", src, exc)
+            self.undo.discard_actions([log_id])
             self._errors += 1
             return
 
-        # Log for undo (keep originals — archive is additive)
-        self.undo.log_action(
-            file_id=file_id,
-            action="ARCHIVED",
-            source_path=source_path,
-            dest_path=str(archive_path),
-            batch_id=batch_id,
-            checksum_before=checksum_before,
-        )
         self._archived += 1
         logger.info("Archived: %s -> %s", src, archive_path)
@@ -24,7 +24,7 @@ from rich.console import Console
 from rich.table import Table
 
 from drivemindr import __version__
-from drivemindr.config import setup_logging
+from drivemindr.config import CHECKSUM_ALGORITHM, CHECKSUM_WORKERS, setup_logging
 from drivemindr.database import Database
 from drivemindr.scanner import FileScanner
 from drivemindr.utils import format_bytes, format_count
@@ -76,7 +76,8 @@ def scan(
 
     try:
         scanner = FileScanner(database)
-        summary = scanner.scan(root, progress_callback=_progress)
+        # Installed apps are read from the Windows Registry alongside the walk
+        summary = scanner.scan_all(root, progress_callback=_progress)
         console.print()  # newline after progress
 
         # Show summary table
@@ -89,11 +90,7 @@ def scan(
         table.add_row("Errors", format_count(summary["errors"]))
         table.add_row("Scan ID", summary["scan_id"])
         console.print(table)
-
-        # Registry scan (Windows only)
-        console.print("\n[dim]Scanning installed applications (Windows Registry)...[/dim]")
-        app_count = scanner.scan_installed_apps()
-        console.print(f"  Found [green]{app_count}[/green] installed applications.\n")
+        console.print(f"  Found [green]{summary['apps']}[/green] installed applications.\n")
 
         logger.info("Scan command completed successfully — scan_id=%s", summary["scan_id"])
     except FileNotFoundError as exc:
@@ -248,6 +245,13 @@ def execute(
     dry_run: bool = typer.Option(
         False, "--dry-run", help="Preview actions without making any changes.",
     ),
+    sha256: bool = typer.Option(
+        False, "--sha256", help="Verify files with SHA-256 instead of BLAKE3.",
+    ),
+    hash_workers: int = typer.Option(
+        CHECKSUM_WORKERS, "--hash-workers",
+        help="Threads hashing files before execution (0 = auto, 1 for HDDs).",
+    ),
 ) -> None:
     """Execute user-approved actions (move, delete, archive).
 
@@ -281,7 +285,11 @@ def execute(
                 console.print("[dim]Aborted.[/dim]")
                 raise typer.Exit(code=0)
 
-        engine = ExecutionEngine(database)
+        engine = ExecutionEngine(
+            database,
+            checksum_algorithm="sha256" if sha256 else CHECKSUM_ALGORITHM,
+            checksum_workers=hash_workers,
+        )
 
         def _progress(moved: int, deleted: int, archived: int, errors: int) -> None:
             console.print(
@@ -13,6 +13,7 @@ Features:
 
 from __future__ import annotations
 
+import ipaddress
 import logging
 import platform
 import socket
@@ -30,7 +31,24 @@ ALLOWED_ENDPOINTS: set[tuple[str, int]] = {
 }
 
 # Loopback addresses that are always safe
-LOOPBACK_ADDRS: set[str] = {"127.0.0.1", "::1", "0.0.0.0", "::"}
+LOOPBACK_ADDRS: frozenset[str] = frozenset({"127.0.0.1", "::1", "0.0.0.0", "::"})
+
+# The whole loopback range, for peers such as 127.0.1.1 that the exact set misses
+_LOOPBACK_NETS = (
+    ipaddress.ip_network("127.0.0.0/8"),
+    ipaddress.ip_network("::1/128"),
+)
+
+
+def _is_loopback(ip: str) -> bool:
+    """True for any loopback or unspecified address (IPv4 or IPv6)."""
+    if ip in LOOPBACK_ADDRS:
+        return True
+    try:
+        addr = ipaddress.ip_address(ip)
+    except ValueError:
+        return False
+    return any(addr in net for net in _LOOPBACK_NETS)
 
 
 @dataclass
@@ -42,6 +60,24 @@ class NetworkCheckResult:
     warnings: list[str] = field(default_factory=list)
 
 
+def _proc_name(pid: int | None, cache: dict[int, str]) -> str:
+    """Process name for *pid*, memoised in *cache* for one connection sweep.
+
+    The cache lives only as long as a single check, so a recycled PID
+    cannot pick up a stale name.
+    """
+    if not pid:
+        return "unknown"
+    name = cache.get(pid)
+    if name is None:
+        try:
+            name = psutil.Process(pid).name()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            name = "unknown"
+        cache[pid] = name
+    return name
+
+
 def check_outbound_connections() -> NetworkCheckResult:
     """Check for any active outbound connections that aren't localhost.
 
@@ -56,29 +92,26 @@ def check_outbound_connections() -> NetworkCheckResult:
         result.warnings.append(f"Cannot check connections: {exc}")
         return result
 
-    for conn in connections:
-        if conn.status != "ESTABLISHED":
-            continue
-        if not conn.raddr:
-            continue
+    # One name lookup per PID; a browser can hold hundreds of sockets
+    proc_names: dict[int, str] = {}
+
+    # Most sockets are listeners or loopback traffic; drop them in one pass
+    # before the per-connection work below.
+    remote = [
+        c for c in connections
+        if c.status == "ESTABLISHED" and c.raddr and not _is_loopback(c.raddr.ip)
+    ]
 
+    for conn in remote:
         remote_ip = conn.raddr.ip
         remote_port = conn.raddr.port
 
-        # Allow loopback
-        if remote_ip in LOOPBACK_ADDRS:
-            continue
-
         # Allow explicitly permitted endpoints
         if (remote_ip, remote_port) in ALLOWED_ENDPOINTS:
             continue
 
         # This is a suspicious outbound connection
-        try:
-            proc = psutil.Process(conn.pid) if conn.pid else None
-            proc_name = proc.name() if proc else "unknown"
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            proc_name = "unknown"
+        proc_name = _proc_name(conn.pid, proc_names)
 
         suspicious = {
             "remote_ip": remote_ip,
@@ -13,10 +13,12 @@ No network calls. No exceptions. Safety always wins.
 
 from __future__ import annotations
 
+import functools
 import logging
-from dataclasses import dataclass, field
+import re
+from dataclasses import dataclass
 from pathlib import PureWindowsPath
-from typing import Any
+from typing import Any, Final, Sequence
 
 from drivemindr.config import (
     CONFIDENCE_AUTO_APPROVE,
@@ -30,10 +32,64 @@ from drivemindr.config import (
 
 logger = logging.getLogger("drivemindr.safety")
 
+# Lookup tables built once at import; SafetyEngine instances share them.
+# A path is protected when it equals an entry or lies beneath one, compared
+# component by component on the PureWindowsPath-normalized, lower-cased string.
+_PROTECTED_EXACT: frozenset[str] = frozenset(
+    str(PureWindowsPath(p)).lower() for p in PROTECTED_PATHS
+)
+# Marks a trie node where a protected entry ends
+_END: Final = object()
+
+
+def _build_trie(paths: frozenset[str]) -> dict[Any, Any]:
+    """Nested ``{component: node}`` dicts, one level per path component."""
+    root: dict[Any, Any] = {}
+    for path in paths:
+        node = root
+        for part in path.rstrip("\\").split("\\"):
+            node = node.setdefault(part, {})
+        node[_END] = True
+    return root
+
+
+# Lookup walks at most one node per component of the checked path instead of
+# testing every entry as a prefix.
+_PROTECTED_TRIE: dict[Any, Any] = _build_trie(_PROTECTED_EXACT)
+# Drive prefixes ("c:") of the entries above; paths on any other drive
+# are rejected before paying for normalization.
+_PROTECTED_DRIVES: frozenset[str] = frozenset(p[:2] for p in _PROTECTED_EXACT)
+_DELETE_ACTIONS: frozenset[str] = frozenset({"DELETE_JUNK", "DELETE_UNUSED", "DELETE"})
+_PROTECTED_OWNERS_LOWER: frozenset[str] = frozenset(o.lower() for o in PROTECTED_OWNERS)
+
+
+def _minimal_patterns(patterns: list[str]) -> tuple[str, ...]:
+    """Lower-cased patterns minus any that contain another pattern.
+
+    For an "appears anywhere" test ``.env.local`` adds nothing once ``.env``
+    is present, so dropping it leaves the answer unchanged with fewer
+    alternatives to try at each position.
+    """
+    lowered = {p.lower() for p in patterns}
+    return tuple(sorted(
+        p for p in lowered if not any(q != p and q in p for q in lowered)
+    ))
+
 
-@dataclass
+# Any sensitive pattern appearing anywhere in the lower-cased file name; one
+# compiled alternation instead of a substring test per pattern.
+_SENSITIVE_RE: re.Pattern[str] = re.compile(
+    "|".join(re.escape(p) for p in _minimal_patterns(SENSITIVE_FILE_PATTERNS))
+)
+
+
+@dataclass(frozen=True, slots=True)
 class SafetyVerdict:
-    """Result of running a file through the safety engine."""
+    """Result of running a file through the safety engine.
+
+    Immutable and slotted: ``check`` builds each verdict once, after every
+    layer has run.
+    """
 
     original_action: str
     final_action: str
@@ -44,13 +100,81 @@ class SafetyVerdict:
     overridden: bool = False
     override_reason: str = ""
     needs_review: bool = False
-    warnings: list[str] = field(default_factory=list)
+    warnings: tuple[str, ...] = ()
 
     @property
     def was_modified(self) -> bool:
         return self.original_action != self.final_action
 
 
+def _last_name(path: str) -> str:
+    """Final path component, as ``PureWindowsPath.name`` gives it.
+
+    Slices after the last separator; a path ending in a separator or a dot
+    (``report.docx\\``, ``server.pem\\.``) takes the full parse instead, so
+    trailing ``.`` components and separators are dropped as pathlib does.
+    """
+    if path and path[-1] in "\\/.":
+        return PureWindowsPath(path).name
+    sep = max(path.rfind("\\"), path.rfind("/"))
+    if sep < 0 and path[1:2] == ":" and path[:1].isalpha():
+        sep = 1  # drive-relative "c:name"
+    return path[sep + 1:]
+
+
+def _fast_ext(path: str) -> str:
+    """Suffix of the last path component, as ``PureWindowsPath.suffix`` gives it.
+
+    One ``str.rfind`` on the name instead of parsing the whole path. A
+    leading dot (``.env``) or a trailing one does not count as an extension.
+    """
+    name = _last_name(path)
+    dot = name.rfind(".")
+    if dot <= 0 or dot == len(name) - 1:
+        return ""
+    return name[dot:]
+
+
+def is_protected_path_lower(path_lower: str) -> bool:
+    """Protected-path test on an already lower-cased path.
+
+    Layer 1 of :class:`SafetyEngine`, public so the scanner can skip
+    protected directories with the same trie.
+    """
+    if path_lower[:2] not in _PROTECTED_DRIVES:
+        return False
+    node = _PROTECTED_TRIE
+    for part in str(PureWindowsPath(path_lower)).split("\\"):
+        node = node.get(part)
+        if node is None:
+            return False
+        if _END in node:
+            return True
+    return False
+
+
+def _is_sensitive_lower(path_lower: str) -> bool:
+    """Sensitive-name test on an already lower-cased path (file name only)."""
+    return _SENSITIVE_RE.search(_last_name(path_lower)) is not None
+
+
+@functools.lru_cache(maxsize=65536)
+def _path_flags(path_lower: str) -> tuple[bool, bool, str]:
+    """``(protected, sensitive, extension)`` for a lower-cased path, memoised.
+
+    Only the path-derived layers are cached: they depend on nothing but the
+    path and the import-time tables, so entries never go stale. Actions,
+    confidences and owners vary per call and are always evaluated fresh.
+    The extension is lower-case, for the guardian's lookup when the caller
+    passes none.
+    """
+    return (
+        is_protected_path_lower(path_lower),
+        _is_sensitive_lower(path_lower),
+        _fast_ext(path_lower),
+    )
+
+
 class SafetyEngine:
     """Multi-layer safety engine that has final say over the AI classifier.
 
@@ -59,23 +183,19 @@ class SafetyEngine:
         engine = SafetyEngine()
         verdict = engine.check(file_path, ai_action, ai_confidence, owner=...)
         # verdict.final_action is the safe action to use
+
+    Stateless: every lookup table is module-level and each verdict is built
+    fresh, so one engine can be shared freely.
     """
 
+    # No instance attributes — keeps the engine immutable
+    __slots__ = ()
+
     def __init__(self) -> None:
-        # Pre-compute normalized protected paths for fast lookups
-        self._protected: list[PureWindowsPath] = [
-            PureWindowsPath(p) for p in PROTECTED_PATHS
-        ]
-        self._protected_owners_lower: set[str] = {
-            o.lower() for o in PROTECTED_OWNERS
-        }
-        self._sensitive_patterns_lower: list[str] = [
-            p.lower() for p in SENSITIVE_FILE_PATTERNS
-        ]
         logger.debug(
             "SafetyEngine initialized — %d protected paths, %d protected owners",
-            len(self._protected),
-            len(self._protected_owners_lower),
+            len(_PROTECTED_EXACT),
+            len(_PROTECTED_OWNERS_LOWER),
         )
 
     # -- public API -----------------------------------------------------------
@@ -101,156 +221,204 @@ class SafetyEngine:
         Returns:
             A ``SafetyVerdict`` with the final safe action.
         """
-        verdict = SafetyVerdict(
-            original_action=ai_action,
-            final_action=ai_action,
-            confidence=ai_confidence,
-        )
-
         logger.debug(
             "Safety check — path=%s action=%s conf=%.2f owner=%s ext=%s",
             file_path, ai_action, ai_confidence, owner, extension,
         )
 
-        # Layer 1: Hardcoded protected paths
-        self._check_protected_path(file_path, verdict)
-        if verdict.is_protected:
-            return verdict  # short-circuit — nothing else matters
+        # Path-derived flags (layers 1, 2 and 2b), memoised per lower-cased path
+        is_protected, is_sensitive, path_ext = _path_flags(file_path.lower())
+
+        # Layer 1: Hardcoded protected paths — short-circuit, nothing else matters
+        if is_protected:
+            logger.warning("Layer 1 block — protected path: %s", file_path)
+            return SafetyVerdict(
+                original_action=ai_action,
+                final_action="KEEP",
+                confidence=ai_confidence,
+                is_protected=True,
+                overridden=True,
+                override_reason="Hardcoded protected path — cannot be modified",
+                warnings=(f"PROTECTED PATH: {file_path}",),
+            )
+
+        # Layer 1b: Protected owners — SYSTEM/TrustedInstaller files are untouchable
+        if owner and owner.lower() in _PROTECTED_OWNERS_LOWER:
+            logger.warning("Layer 1b block — protected owner: %s", owner)
+            return SafetyVerdict(
+                original_action=ai_action,
+                final_action="KEEP",
+                confidence=ai_confidence,
+                is_protected=True,
+                overridden=True,
+                override_reason=f"Protected owner: {owner}",
+                warnings=(f"PROTECTED OWNER: {owner}",),
+            )
 
-        # Layer 1b: Protected owners
-        self._check_protected_owner(owner, verdict)
-        if verdict.is_protected:
-            return verdict
+        final_action = ai_action
+        # Classified once; only ever cleared below, when a layer forces KEEP
+        deleting = self.is_delete_action(ai_action)
+        overridden = False
+        override_reason = ""
+        needs_review = False
+        # Stays the shared empty tuple unless a layer actually warns
+        warnings: tuple[str, ...] = ()
 
         # Layer 2: Document Guardian
-        self._check_guardian(file_path, extension, verdict)
-
-        # Layer 2b: Sensitive file detection
-        self._check_sensitive(file_path, verdict)
+        guardian_ext = (
+            self._guardian_extension(file_path, extension, path_ext) if deleting else ""
+        )
+        if guardian_ext:
+            final_action = "KEEP"
+            deleting = False
+            overridden = True
+            override_reason = (
+                f"Document Guardian — {guardian_ext} files cannot be deleted, only moved/archived"
+            )
+            needs_review = True
+            warnings += (f"GUARDIAN: {guardian_ext} file protected from deletion",)
+
+        # Layer 2b: Sensitive file detection — flag for maximum protection
+        if is_sensitive:
+            warnings += (f"SENSITIVE: {file_path} matches sensitive pattern",)
+            if deleting:
+                final_action = "KEEP"
+                deleting = False
+                overridden = True
+                override_reason = "Sensitive file — cannot be deleted"
+                needs_review = True
+            logger.info("Layer 2b — sensitive file flagged: %s", file_path)
 
         # Layer 3: Confidence thresholds
-        self._check_confidence(verdict)
-
-        if verdict.was_modified:
+        if deleting and ai_confidence < CONFIDENCE_DELETE_MIN:
+            final_action = "KEEP"
+            overridden = True
+            override_reason = (
+                f"Delete requires confidence >= {CONFIDENCE_DELETE_MIN}, "
+                f"got {ai_confidence:.2f}"
+            )
+            needs_review = True
+            logger.info(
+                "Layer 3 override — delete confidence too low: %.2f < %.2f",
+                ai_confidence,
+                CONFIDENCE_DELETE_MIN,
+            )
+        else:
+            review_warning = self._confidence_review(ai_confidence)
+            if review_warning is not None:
+                needs_review = True
+                if review_warning:
+                    warnings += (review_warning,)
+
+        if final_action != ai_action:
             logger.info(
                 "Safety override — path=%s original=%s final=%s reason=%s",
                 file_path,
-                verdict.original_action,
-                verdict.final_action,
-                verdict.override_reason,
+                ai_action,
+                final_action,
+                override_reason,
             )
 
-        return verdict
+        return SafetyVerdict(
+            original_action=ai_action,
+            final_action=final_action,
+            confidence=ai_confidence,
+            is_guardian_protected=bool(guardian_ext),
+            is_sensitive=is_sensitive,
+            overridden=overridden,
+            override_reason=override_reason,
+            needs_review=needs_review,
+            warnings=warnings,
+        )
+
+    def check_many(
+        self,
+        file_paths: Sequence[str],
+        ai_actions: Sequence[str],
+        ai_confidences: Sequence[float],
+        *,
+        owners: Sequence[str | None] | None = None,
+        extensions: Sequence[str | None] | None = None,
+    ) -> list[SafetyVerdict]:
+        """Run a whole batch through :meth:`check`, one verdict per path.
+
+        The parallel sequences must be the same length; ``owners`` and
+        ``extensions`` default to None for every file.
+        """
+        n = len(file_paths)
+        if not len(ai_actions) == len(ai_confidences) == n:
+            raise ValueError("check_many: paths, actions and confidences differ in length")
+        none = (None,) * n
+        check = self.check
+        return [
+            check(path, action, conf, owner=owner, extension=ext)
+            for path, action, conf, owner, ext in zip(
+                file_paths, ai_actions, ai_confidences,
+                owners if owners is not None else none,
+                extensions if extensions is not None else none,
+            )
+        ]
+
+    @staticmethod
+    def cache_info() -> Any:
+        """Hit/miss counters of the shared path-flag cache."""
+        return _path_flags.cache_info()
 
     def is_path_protected(self, file_path: str) -> bool:
         """Quick check: is this path under a hardcoded protected directory?"""
-        normalized = PureWindowsPath(file_path)
-        for protected in self._protected:
-            try:
-                normalized.relative_to(protected)
-                return True
-            except ValueError:
-                continue
-        return False
+        return is_protected_path_lower(file_path.lower())
 
     def is_delete_action(self, action: str) -> bool:
         """Check if an action is a delete variant."""
-        return action.upper() in ("DELETE_JUNK", "DELETE_UNUSED", "DELETE")
+        return action in _DELETE_ACTIONS or action.upper() in _DELETE_ACTIONS
 
     def is_sensitive_file(self, file_path: str) -> bool:
         """Check if a file matches sensitive file patterns."""
-        lower_path = file_path.lower()
-        name = PureWindowsPath(lower_path).name
-        for pattern in self._sensitive_patterns_lower:
-            if pattern in name:
-                return True
-        return False
+        return _is_sensitive_lower(file_path.lower())
 
     # -- layer implementations ------------------------------------------------
 
-    def _check_protected_path(self, file_path: str, verdict: SafetyVerdict) -> None:
-        """Layer 1: Hardcoded protected paths — AI cannot override."""
-        if self.is_path_protected(file_path):
-            verdict.is_protected = True
-            verdict.final_action = "KEEP"
-            verdict.overridden = True
-            verdict.override_reason = "Hardcoded protected path — cannot be modified"
-            verdict.warnings.append(f"PROTECTED PATH: {file_path}")
-            logger.warning("Layer 1 block — protected path: %s", file_path)
-
-    def _check_protected_owner(self, owner: str | None, verdict: SafetyVerdict) -> None:
-        """Layer 1b: Protected owner — SYSTEM/TrustedInstaller files are untouchable."""
-        if owner and owner.lower() in self._protected_owners_lower:
-            verdict.is_protected = True
-            verdict.final_action = "KEEP"
-            verdict.overridden = True
-            verdict.override_reason = f"Protected owner: {owner}"
-            verdict.warnings.append(f"PROTECTED OWNER: {owner}")
-            logger.warning("Layer 1b block — protected owner: %s", owner)
+    def _guardian_extension(
+        self, file_path: str, extension: str | None, path_ext: str,
+    ) -> str:
+        """Layer 2: Document Guardian — docs/photos/code can never be auto-deleted.
 
-    def _check_guardian(self, file_path: str, extension: str | None, verdict: SafetyVerdict) -> None:
-        """Layer 2: Document Guardian — docs/photos/code can never be auto-deleted."""
-        if not self.is_delete_action(verdict.final_action):
-            return  # only intervene on delete actions
-
-        ext = extension or PureWindowsPath(file_path).suffix
-        if ext and ext.lower() in GUARDIAN_EXTENSIONS:
-            verdict.is_guardian_protected = True
-            verdict.final_action = "KEEP"
-            verdict.overridden = True
-            verdict.override_reason = (
-                f"Document Guardian — {ext} files cannot be deleted, only moved/archived"
-            )
-            verdict.needs_review = True
-            verdict.warnings.append(f"GUARDIAN: {ext} file protected from deletion")
-            logger.info(
-                "Layer 2 override — guardian protected: %s (ext=%s)", file_path, ext
-            )
-
-    def _check_sensitive(self, file_path: str, verdict: SafetyVerdict) -> None:
-        """Layer 2b: Sensitive file detection — flag for maximum protection."""
-        if self.is_sensitive_file(file_path):
-            verdict.is_sensitive = True
-            verdict.warnings.append(f"SENSITIVE: {file_path} matches sensitive pattern")
-            if self.is_delete_action(verdict.final_action):
-                verdict.final_action = "KEEP"
-                verdict.overridden = True
-                verdict.override_reason = "Sensitive file — cannot be deleted"
-                verdict.needs_review = True
-            logger.info("Layer 2b — sensitive file flagged: %s", file_path)
-
-    def _check_confidence(self, verdict: SafetyVerdict) -> None:
-        """Layer 3: Confidence thresholds — low confidence routes to manual review."""
-        # Delete actions need extra-high confidence
-        if self.is_delete_action(verdict.final_action):
-            if verdict.confidence < CONFIDENCE_DELETE_MIN:
-                verdict.final_action = "KEEP"
-                verdict.overridden = True
-                verdict.override_reason = (
-                    f"Delete requires confidence >= {CONFIDENCE_DELETE_MIN}, "
-                    f"got {verdict.confidence:.2f}"
-                )
-                verdict.needs_review = True
-                logger.info(
-                    "Layer 3 override — delete confidence too low: %.2f < %.2f",
-                    verdict.confidence,
-                    CONFIDENCE_DELETE_MIN,
-                )
-                return
-
-        # General low-confidence → manual review
-        if verdict.confidence < CONFIDENCE_UNCERTAIN:
-            verdict.needs_review = True
-            verdict.warnings.append(
-                f"UNCERTAIN: confidence {verdict.confidence:.2f} < {CONFIDENCE_UNCERTAIN}"
-            )
-            logger.info(
-                "Layer 3 flag — uncertain confidence: %.2f", verdict.confidence
-            )
-        elif verdict.confidence < CONFIDENCE_AUTO_APPROVE:
-            verdict.needs_review = True
+        Called for delete actions only, with the caller's extension and the
+        lower-cased one from the path-flag cache. The cached suffix is only
+        looked up; messages report the file's own spelling (``.DOCX``).
+        Returns the protected extension when the delete must be blocked,
+        else "".
+        """
+        if extension:
+            # Scanner-stored extensions are already lower-case; only
+            # mixed-case names pay for .lower()
+            if not (
+                extension in GUARDIAN_EXTENSIONS
+                or extension.lower() in GUARDIAN_EXTENSIONS
+            ):
+                return ""
+            ext = extension
+        elif path_ext in GUARDIAN_EXTENSIONS:
+            ext = _fast_ext(file_path)
+        else:
+            return ""
+        logger.info("Layer 2 override — guardian protected: %s (ext=%s)", file_path, ext)
+        return ext
+
+    def _confidence_review(self, confidence: float) -> str | None:
+        """Layer 3: low confidence routes to manual review.
+
+        Returns None when no review is needed, otherwise the warning to
+        attach ("" for a plain needs-review flag).
+        """
+        if confidence < CONFIDENCE_UNCERTAIN:
+            logger.info("Layer 3 flag — uncertain confidence: %.2f", confidence)
+            return f"UNCERTAIN: confidence {confidence:.2f} < {CONFIDENCE_UNCERTAIN}"
+        if confidence < CONFIDENCE_AUTO_APPROVE:
             logger.debug(
                 "Layer 3 flag — needs review: confidence %.2f < %.2f",
-                verdict.confidence,
+                confidence,
                 CONFIDENCE_AUTO_APPROVE,
             )
+            return ""
+        return None
@@ -8,25 +8,40 @@ Never reads file contents. Never makes network calls.
 from __future__ import annotations
 
 import datetime
+import functools
 import logging
 import os
 import platform
+import queue
+import stat
+import sys
+import threading
 import uuid
-from pathlib import Path, PureWindowsPath
+from pathlib import Path
 from typing import Any
 
-from drivemindr.config import PROTECTED_PATHS, SCANNER_SKIP_DIRS
+from drivemindr.config import SCANNER_BATCH_SIZE, SCANNER_SKIP_DIRS
 from drivemindr.database import Database
+from drivemindr.safety import is_protected_path_lower
 
 logger = logging.getLogger("drivemindr.scanner")
 
+# Metadata batches allowed in flight between the walker and the DB writer.
+# Bounded so a slow disk for SQLite can't let the walker buffer a whole drive.
+_WRITE_QUEUE_DEPTH = 4
+
 
 def _is_windows() -> bool:
     return platform.system() == "Windows"
 
 
+@functools.lru_cache(maxsize=8192)
 def _timestamp(epoch: float | None) -> str | None:
-    """Convert an epoch float to an ISO-format local timestamp string."""
+    """Convert an epoch float to an ISO-format local timestamp string.
+
+    Memoised: a file's three times are often identical, and installers
+    stamp whole trees with the same one.
+    """
     if epoch is None:
         return None
     try:
@@ -35,7 +50,7 @@ def _timestamp(epoch: float | None) -> str | None:
         return None
 
 
-def _get_file_owner(path: Path) -> str | None:
+def _get_file_owner(path: str) -> str | None:
     """Get the file owner on Windows. Returns None on other platforms or on error."""
     if not _is_windows():
         return None
@@ -49,7 +64,7 @@ def _get_file_owner(path: Path) -> str | None:
         SE_FILE_OBJECT = 1
         OWNER_SECURITY_INFORMATION = 0x00000001
 
-        path_str = str(path)
+        path_str = path
         size_needed = wintypes.DWORD(0)
 
         advapi32.GetFileSecurityW(
@@ -94,45 +109,51 @@ def _get_file_owner(path: Path) -> str | None:
     return None
 
 
-def _should_skip_dir(dir_name: str) -> bool:
-    """Check if a directory name should be skipped during scanning."""
-    return dir_name in SCANNER_SKIP_DIRS
-
-
 def _is_under_protected_path(file_path: str) -> bool:
     """Check if a path is under any hardcoded protected path."""
-    # Normalize to Windows path representation for comparison
-    normalized = PureWindowsPath(file_path)
-    for protected in PROTECTED_PATHS:
-        protected_p = PureWindowsPath(protected)
-        try:
-            normalized.relative_to(protected_p)
-            return True
-        except ValueError:
-            continue
-    return False
+    # Same component trie the safety engine's Layer 1 walks
+    return is_protected_path_lower(file_path.lower())
+
+
+def _suffix(name: str) -> str:
+    """Lower-cased extension of *name*, matching ``PurePath.suffix`` semantics.
+
+    Dotfiles (``.env``) and trailing dots (``file.``) have no suffix.
+    Interned, so every row of a batch shares one string per extension.
+    """
+    dot = name.rfind(".")
+    if 0 < dot < len(name) - 1:
+        return sys.intern(name[dot:].lower())
+    return ""
 
 
 def _collect_metadata(entry: os.DirEntry[str], scan_id: str) -> dict[str, Any] | None:
     """Collect metadata for a single file/directory entry.
 
+    Works on the entry's strings directly — no Path objects per entry.
+    Everything but the owner comes from one ``lstat`` (free on Windows,
+    where ``scandir`` already returned it): the read-only flag is the
+    mode's write bit, which Windows derives from FILE_ATTRIBUTE_READONLY,
+    rather than a separate ``os.access`` call per entry.
     Returns None if metadata cannot be read (permission denied, etc.).
     """
     try:
-        stat = entry.stat(follow_symlinks=False)
-        path = Path(entry.path)
+        st = entry.stat(follow_symlinks=False)
+        entry_path = entry.path
+        mode = st.st_mode
+        is_dir = stat.S_ISDIR(mode)
         return {
-            "path": str(path),
+            "path": entry_path,
             "name": entry.name,
-            "extension": path.suffix.lower() if not entry.is_dir(follow_symlinks=False) else None,
-            "size_bytes": stat.st_size if not entry.is_dir(follow_symlinks=False) else 0,
-            "created": _timestamp(stat.st_ctime),
-            "modified": _timestamp(stat.st_mtime),
-            "accessed": _timestamp(stat.st_atime),
-            "owner": _get_file_owner(path),
-            "is_readonly": 1 if not os.access(entry.path, os.W_OK) else 0,
-            "is_dir": 1 if entry.is_dir(follow_symlinks=False) else 0,
-            "parent_dir": str(path.parent),
+            "extension": None if is_dir else _suffix(entry.name),
+            "size_bytes": 0 if is_dir else st.st_size,
+            "created": _timestamp(st.st_ctime),
+            "modified": _timestamp(st.st_mtime),
+            "accessed": _timestamp(st.st_atime),
+            "owner": _get_file_owner(entry_path),
+            "is_readonly": 0 if mode & stat.S_IWRITE else 1,
+            "is_dir": 1 if is_dir else 0,
+            "parent_dir": os.path.dirname(entry_path),
             "scan_id": scan_id,
         }
     except PermissionError:
@@ -153,8 +174,9 @@ class FileScanner:
         self._dir_count = 0
         self._error_count = 0
         self._total_bytes = 0
-        # Track per-directory sizes for aggregation
-        self._dir_sizes: dict[str, tuple[int, int]] = {}  # path → (bytes, count)
+        # Walker → writer hand-off, live only for the duration of scan()
+        self._write_queue: queue.Queue[list[dict[str, Any]] | None] | None = None
+        self._writer_error: BaseException | None = None
 
     # -- public API -----------------------------------------------------------
 
@@ -164,7 +186,9 @@ class FileScanner:
         Args:
             root: The top-level path to scan (e.g. ``C:\\``).
             progress_callback: Optional callable(scanned: int, errors: int)
-                invoked periodically so the caller can show progress.
+                invoked once per flushed batch (every ``SCANNER_BATCH_SIZE``
+                rows) and once for the final partial batch, so its cost
+                stays independent of the number of files.
 
         Returns:
             Summary dict with ``files``, ``dirs``, ``errors``, ``total_bytes``.
@@ -178,11 +202,33 @@ class FileScanner:
             logger.error("Scan root does not exist: %s", root_path)
             raise FileNotFoundError(f"Scan root does not exist: {root_path}")
 
-        self._walk(str(root_path), progress_callback)
+        # Directory enumeration and SQLite writes overlap: the walker queues
+        # full batches and keeps going while a single writer thread drains them.
+        writes: queue.Queue[list[dict[str, Any]] | None] = queue.Queue(
+            maxsize=_WRITE_QUEUE_DEPTH
+        )
+        writer = threading.Thread(
+            target=self._drain_writes,
+            args=(writes,),
+            name="drivemindr-scan-writer",
+            daemon=True,
+        )
+        self._write_queue = writes
+        self._writer_error = None
+        writer.start()
+        try:
+            self._walk(str(root_path), progress_callback)
+        finally:
+            writes.put(None)
+            writer.join()
+            self._write_queue = None
 
-        # Flush dir size aggregations
-        for dir_path, (total_bytes, file_count) in self._dir_sizes.items():
-            self.db.upsert_dir_size(dir_path, total_bytes, file_count, self.scan_id)
+        if self._writer_error is not None:
+            logger.error("Scan aborted — database writer failed")
+            raise self._writer_error
+
+        # Per-directory totals are aggregated by SQLite from this scan's rows
+        self.db.aggregate_dir_sizes(self.scan_id)
 
         summary = {
             "files": self._file_count,
@@ -200,16 +246,51 @@ class FileScanner:
         )
         return summary
 
+    def scan_all(self, root: str | Path, *, progress_callback: Any = None) -> dict[str, Any]:
+        """Scan *root* and the installed-apps registry concurrently.
+
+        The registry is read on a background thread while the file walk runs
+        (different subsystems, no shared data). Registry rows are written to
+        the database on the calling thread once both finish, so DB access is
+        never interleaved.
+
+        Returns the :meth:`scan` summary plus an ``apps`` count.
+        """
+        registry: list[dict[str, Any]] = []
+        reader = threading.Thread(
+            target=lambda: registry.extend(self._read_installed_apps()),
+            name="drivemindr-registry",
+            daemon=True,
+        )
+        reader.start()
+        try:
+            summary: dict[str, Any] = self.scan(root, progress_callback=progress_callback)
+        finally:
+            reader.join()
+
+        summary["apps"] = self._store_installed_apps(registry)
+        return summary
+
     def scan_installed_apps(self) -> int:
         """Scan Windows Registry for installed applications.
 
         Returns the number of apps found. No-op on non-Windows.
         """
+        return self._store_installed_apps(self._read_installed_apps())
+
+    # -- internal -------------------------------------------------------------
+
+    def _read_installed_apps(self) -> list[dict[str, Any]]:
+        """Read installed-app entries from the Uninstall registry keys.
+
+        Touches only the registry, never the database — safe to run on a
+        background thread. Returns an empty list on non-Windows.
+        """
         if not _is_windows():
             logger.info("Skipping registry scan — not running on Windows")
-            return 0
+            return []
 
-        count = 0
+        apps: list[dict[str, Any]] = []
         try:
             import winreg
 
@@ -255,8 +336,7 @@ class FileScanner:
                             if size_str and size_str.isdigit():
                                 app_data["estimated_size"] = int(size_str) * 1024  # KB → bytes
 
-                            self.db.upsert_installed_app(app_data)
-                            count += 1
+                            apps.append(app_data)
 
                         winreg.CloseKey(subkey)
                         i += 1
@@ -269,69 +349,111 @@ class FileScanner:
         except Exception:
             logger.exception("Error during registry scan")
 
-        logger.info("Registry scan complete — found %d installed apps", count)
-        return count
-
-    # -- internal -------------------------------------------------------------
+        return apps
+
+    def _store_installed_apps(self, apps: list[dict[str, Any]]) -> int:
+        """Upsert registry entries on the calling thread. Returns the count."""
+        for app_data in apps:
+            self.db.upsert_installed_app(app_data)
+        logger.info("Registry scan complete — found %d installed apps", len(apps))
+        return len(apps)
+
+    def _drain_writes(self, writes: queue.Queue[list[dict[str, Any]] | None]) -> None:
+        """Writer thread: upsert queued batches until the ``None`` sentinel."""
+        while True:
+            batch = writes.get()
+            if batch is None:
+                return
+            if self._writer_error is not None:
+                continue  # keep draining so the walker never blocks on a full queue
+            try:
+                self.db.bulk_upsert_files(batch)
+            except BaseException as exc:  # re-raised in scan() after join
+                self._writer_error = exc
+
+    def _flush(self, batch: list[dict[str, Any]]) -> None:
+        """Hand a full batch to the writer thread (blocks if it is behind).
+
+        Raises the writer's error instead once it has failed, so the walk
+        stops at its next batch rather than enumerating the rest of the drive.
+        """
+        assert self._write_queue is not None, "_flush called outside scan()"
+        if self._writer_error is not None:
+            logger.error("Scan aborted — database writer failed")
+            raise self._writer_error
+        self._write_queue.put(batch)
 
     def _walk(self, root: str, progress_callback: Any) -> None:
-        """Walk the directory tree using os.scandir for performance."""
+        """Walk the directory tree iteratively using os.scandir.
+
+        Each directory is listed once and split into subdirectories (pushed
+        onto the pending stack) and files (collected in one pass), so there is
+        no recursion depth limit and per-entry branching stays minimal.
+        """
+        # Hoisted locals — this loop runs once per entry on the drive
+        scan_id = self.scan_id
+        skip_dirs = SCANNER_SKIP_DIRS  # frozenset — O(1) membership, no call per entry
+        collect = _collect_metadata
         batch: list[dict[str, Any]] = []
-        batch_size = 500
+        batch_size = SCANNER_BATCH_SIZE
+        pending = [root]
+        push = pending.append
+
+        while pending:
+            current = pending.pop()
+            try:
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except PermissionError:
+                self._error_count += 1
+                logger.warning("Permission denied opening dir: %s", current)
+                continue
+            except OSError as exc:
+                self._error_count += 1
+                logger.warning("OS error opening dir: %s — %s", current, exc)
+                continue
+
+            files: list[os.DirEntry[str]] = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except PermissionError:
+                    self._error_count += 1
+                    logger.warning("Permission denied during walk: %s", entry.path)
+                    continue
+                except OSError as exc:
+                    self._error_count += 1
+                    logger.warning("OS error during walk: %s — %s", entry.path, exc)
+                    continue
 
-        try:
-            with os.scandir(root) as entries:
-                for entry in entries:
-                    try:
-                        if entry.is_dir(follow_symlinks=False):
-                            if _should_skip_dir(entry.name):
-                                logger.debug("Skipping dir: %s", entry.path)
-                                continue
-                            self._dir_count += 1
-                            # Record the directory itself
-                            meta = _collect_metadata(entry, self.scan_id)
-                            if meta:
-                                batch.append(meta)
-                            # Recurse
-                            self._walk(entry.path, progress_callback)
-                        else:
-                            meta = _collect_metadata(entry, self.scan_id)
-                            if meta:
-                                self._file_count += 1
-                                self._total_bytes += meta["size_bytes"]
-                                batch.append(meta)
-
-                                # Track per-parent-dir sizes
-                                parent = meta["parent_dir"]
-                                cur_bytes, cur_count = self._dir_sizes.get(parent, (0, 0))
-                                self._dir_sizes[parent] = (
-                                    cur_bytes + meta["size_bytes"],
-                                    cur_count + 1,
-                                )
-
-                    except PermissionError:
-                        self._error_count += 1
-                        logger.warning("Permission denied during walk: %s", entry.path)
-                    except OSError as exc:
-                        self._error_count += 1
-                        logger.warning("OS error during walk: %s — %s", entry.path, exc)
-
-                    # Flush batch
-                    if len(batch) >= batch_size:
-                        self.db.bulk_upsert_files(batch)
-                        batch.clear()
-                        if progress_callback:
-                            progress_callback(self._file_count, self._error_count)
-
-        except PermissionError:
-            self._error_count += 1
-            logger.warning("Permission denied opening dir: %s", root)
-        except OSError as exc:
-            self._error_count += 1
-            logger.warning("OS error opening dir: %s — %s", root, exc)
+                if not is_dir:
+                    files.append(entry)
+                elif entry.name in skip_dirs:
+                    logger.debug("Skipping dir: %s", entry.path)
+                else:
+                    self._dir_count += 1
+                    # Record the directory itself, then descend into it later
+                    meta = collect(entry, scan_id)
+                    if meta:
+                        batch.append(meta)
+                    push(entry.path)
+
+            file_metas = [m for m in [collect(e, scan_id) for e in files] if m]
+            if file_metas:
+                dir_bytes = sum([m["size_bytes"] for m in file_metas])
+                self._file_count += len(file_metas)
+                self._total_bytes += dir_bytes
+                batch.extend(file_metas)
+
+            # Flush batch
+            if len(batch) >= batch_size:
+                self._flush(batch)
+                batch = []
+                if progress_callback:
+                    progress_callback(self._file_count, self._error_count)
 
         # Flush remaining
         if batch:
-            self.db.bulk_upsert_files(batch)
+            self._flush(batch)
             if progress_callback:
                 progress_callback(self._file_count, self._error_count)
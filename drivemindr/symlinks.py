@@ -26,10 +26,10 @@ import logging
 import os
 import platform
 import shutil
-import subprocess
+import struct
 from pathlib import Path
 
-from drivemindr.undo import UndoManager, file_checksum
+from drivemindr.undo import UndoManager, fast_move, file_checksum
 
 logger = logging.getLogger("drivemindr.symlinks")
 
@@ -56,6 +56,76 @@ def is_junction(path: Path) -> bool:
     return path.is_symlink()
 
 
+# Win32 constants for building a mount-point (junction) reparse buffer
+_GENERIC_WRITE = 0x40000000
+_OPEN_EXISTING = 3
+_FILE_FLAG_OPEN_REPARSE_POINT = 0x00200000
+_FILE_FLAG_BACKUP_SEMANTICS = 0x02000000
+_FSCTL_SET_REPARSE_POINT = 0x000900A4
+_IO_REPARSE_TAG_MOUNT_POINT = 0xA0000003
+
+
+def _set_mount_point(link_path: Path, target_path: Path) -> None:
+    """Create *link_path* as a junction to *target_path* via DeviceIoControl.
+
+    Equivalent to ``mklink /J`` without spawning ``cmd.exe``: create an empty
+    directory, open it as a reparse point, and write a REPARSE_DATA_BUFFER
+    with the ``IO_REPARSE_TAG_MOUNT_POINT`` tag. Raises OSError on failure.
+    """
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)  # type: ignore[attr-defined]
+    kernel32.CreateFileW.restype = wintypes.HANDLE
+    kernel32.CreateFileW.argtypes = [
+        wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+        wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE,
+    ]
+    kernel32.DeviceIoControl.argtypes = [
+        wintypes.HANDLE, wintypes.DWORD, wintypes.LPVOID, wintypes.DWORD,
+        wintypes.LPVOID, wintypes.DWORD, ctypes.POINTER(wintypes.DWORD), wintypes.LPVOID,
+    ]
+
+    target = os.path.abspath(str(target_path))
+    substitute = ("\\??\\" + target).encode("utf-16-le")
+    printable = target.encode("utf-16-le")
+    path_buffer = substitute + b"\0\0" + printable + b"\0\0"
+    header = struct.pack(
+        "<IHHHHHH",
+        _IO_REPARSE_TAG_MOUNT_POINT,
+        8 + len(path_buffer),       # ReparseDataLength: offsets/lengths + PathBuffer
+        0,                          # Reserved
+        0,                          # SubstituteNameOffset
+        len(substitute),            # SubstituteNameLength (bytes, no terminator)
+        len(substitute) + 2,        # PrintNameOffset
+        len(printable),             # PrintNameLength
+    )
+    data = header + path_buffer
+
+    os.mkdir(str(link_path))
+    handle = kernel32.CreateFileW(
+        str(link_path), _GENERIC_WRITE, 0, None, _OPEN_EXISTING,
+        _FILE_FLAG_OPEN_REPARSE_POINT | _FILE_FLAG_BACKUP_SEMANTICS, None,
+    )
+    if handle == wintypes.HANDLE(-1).value:
+        err = ctypes.get_last_error()
+        os.rmdir(str(link_path))
+        raise ctypes.WinError(err)  # type: ignore[attr-defined]
+
+    try:
+        returned = wintypes.DWORD(0)
+        ok = kernel32.DeviceIoControl(
+            handle, _FSCTL_SET_REPARSE_POINT, data, len(data),
+            None, 0, ctypes.byref(returned), None,
+        )
+        err = ctypes.get_last_error()
+    finally:
+        kernel32.CloseHandle(handle)
+
+    if not ok:
+        os.rmdir(str(link_path))
+        raise ctypes.WinError(err)  # type: ignore[attr-defined]
+
+
 def create_junction(link_path: Path, target_path: Path) -> bool:
     """Create a Windows Directory Junction.
 
@@ -68,21 +138,13 @@ def create_junction(link_path: Path, target_path: Path) -> bool:
     """
     if platform.system() == "Windows":
         try:
-            result = subprocess.run(
-                ["cmd", "/c", "mklink", "/J", str(link_path), str(target_path)],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            logger.info(
-                "Created junction: %s -> %s (output: %s)",
-                link_path, target_path, result.stdout.strip(),
-            )
+            _set_mount_point(link_path, target_path)
+            logger.info("Created junction: %s -> %s", link_path, target_path)
             return True
-        except subprocess.CalledProcessError as exc:
+        except OSError as exc:
             logger.error(
                 "Failed to create junction %s -> %s: %s",
-                link_path, target_path, exc.stderr,
+                link_path, target_path, exc,
             )
             return False
     else:
@@ -103,23 +165,40 @@ def remove_junction(path: Path) -> bool:
     """Remove a junction/symlink without removing the target directory."""
     try:
         if platform.system() == "Windows":
-            # On Windows, rmdir removes the junction point without touching target
-            subprocess.run(
-                ["cmd", "/c", "rmdir", str(path)],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
+            # os.rmdir → RemoveDirectoryW, which deletes the reparse point
+            # itself and never touches the target's contents
+            os.rmdir(str(path))
         else:
             # On non-Windows, unlink the symlink
             path.unlink()
         logger.info("Removed junction: %s", path)
         return True
-    except (subprocess.CalledProcessError, OSError) as exc:
+    except OSError as exc:
         logger.error("Failed to remove junction %s: %s", path, exc)
         return False
 
 
+def _count_files(root: str | Path) -> int:
+    """Number of files under *root*, walked with ``os.scandir``.
+
+    Directory entries carry their type from the listing itself, so no
+    ``stat`` call is made per file. Symlinked directories are not descended.
+    """
+    count = 0
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        count += 1
+        except OSError as exc:
+            logger.warning("Cannot list %s: %s", exc.filename, exc)
+    return count
+
+
 class AppMigrator:
     """Handles moving applications from C: to D: with junction-based redirection.
 
@@ -203,8 +282,8 @@ class AppMigrator:
             return result
 
         # Step 2: Verify (compare directory file count as basic integrity check)
-        source_count = sum(1 for _ in source.rglob("*") if _.is_file())
-        target_count = sum(1 for _ in target.rglob("*") if _.is_file())
+        source_count = _count_files(source)
+        target_count = _count_files(target)
         if source_count != target_count:
             logger.error(
                 "Copy verification failed: source has %d files, target has %d",
@@ -231,7 +310,7 @@ class AppMigrator:
         if not junction_ok:
             # Rollback: move data back
             logger.warning("Junction creation failed — rolling back")
-            shutil.move(str(target), str(source))
+            fast_move(target, source)
             result["error"] = "Junction creation failed"
             return result
 
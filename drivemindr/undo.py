@@ -15,42 +15,154 @@ Design:
 
 from __future__ import annotations
 
+import errno
 import hashlib
 import logging
+import mmap
+import os
+import secrets
 import shutil
-import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from drivemindr.config import CHECKSUM_ALGORITHM, CHECKSUM_WORKERS
 from drivemindr.database import Database
+from drivemindr.utils import format_bytes
+
+try:  # optional: pip install drivemindr[fast-hash]
+    import blake3 as _blake3
+except ImportError:
+    _blake3 = None
 
 logger = logging.getLogger("drivemindr.undo")
 
+# Tag written in front of stored checksums; untagged values are legacy SHA-256
+_CHECKSUM_TAGS: dict[str, str] = {"blake3": "b3", "sha256": "sha256"}
+_TAG_ALGORITHMS: dict[str, str] = {tag: alg for alg, tag in _CHECKSUM_TAGS.items()}
+
+# (file_id, action, source_path, dest_path, checksum_before, checksum_after, batch_id)
+ActionRow = tuple[int | None, str, str, str | None, str | None, str | None, str | None]
+
+# One shared string so sqlite3's statement cache reuses the prepared INSERT
+_INSERT_ACTION_SQL = """
+INSERT INTO action_log
+    (file_id, action, source_path, dest_path, checksum_before,
+     checksum_after, batch_id)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# action_log columns other than the two checksums
+_ACTION_COLUMNS = "id, file_id, action, source_path, dest_path, batch_id, executed_at, undone"
+
+# Below this, a plain read is cheaper than setting up a mapping
+_MMAP_HASH_MIN_BYTES = 64 * 1024
+
 # Trash location for "deleted" files (so they can be restored)
 DEFAULT_TRASH_DIR = Path(r"D:\DriveMindr\trash")
 
 
 def generate_batch_id() -> str:
-    """Generate a unique batch ID for grouping related operations."""
+    """Generate a unique batch ID for grouping related operations.
+
+    The timestamp keeps IDs (and trash folder names) readable and sortable;
+    the random suffix separates batches started within the same second.
+    """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    short_uuid = uuid.uuid4().hex[:8]
-    return f"batch_{timestamp}_{short_uuid}"
+    return f"batch_{timestamp}_{secrets.token_hex(4)}"
+
 
+def file_checksum(path: str | Path, algorithm: str = "sha256") -> str | None:
+    """Compute a file checksum. Returns None if file doesn't exist or is unreadable.
 
-def file_checksum(path: Path, algorithm: str = "sha256") -> str | None:
-    """Compute a file checksum. Returns None if file doesn't exist or is unreadable."""
+    *algorithm* is any :mod:`hashlib` name, or ``"blake3"`` when the optional
+    ``blake3`` package is installed.
+    """
+    if algorithm == "blake3" and _blake3 is None:
+        raise ValueError("blake3 checksums need the optional 'blake3' package")
     try:
-        h = hashlib.new(algorithm)
-        with open(path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                h.update(chunk)
-        return h.hexdigest()
-    except (OSError, IOError) as exc:
+        if algorithm == "blake3":
+            # update_mmap maps the file and hashes it SIMD-parallel across
+            # threads, with no read loop or copies on the Python side.
+            hasher = _blake3.blake3(max_threads=_blake3.blake3.AUTO)
+            hasher.update_mmap(os.fspath(path))
+            return hasher.hexdigest()
+        with open(path, "rb", buffering=0) as f:
+            if os.fstat(f.fileno()).st_size >= _MMAP_HASH_MIN_BYTES:
+                # Hash straight from the page cache — no kernel→user copy.
+                # mmap can refuse (locked or special files); then stream.
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        hasher = hashlib.new(algorithm)
+                        hasher.update(mm)
+                        return hasher.hexdigest()
+                except (OSError, ValueError):
+                    pass
+            # file_digest runs the read/update loop in C with a large buffer and
+            # releases the GIL while hashing (OpenSSL uses SHA-NI where present).
+            return hashlib.file_digest(f, algorithm).hexdigest()
+    except OSError as exc:
         logger.warning("Could not checksum %s: %s", path, exc)
         return None
 
 
+def fast_move(src: str | Path, dst: str | Path) -> bool:
+    """Move a file, renaming in place when possible.
+
+    Same volume: a single ``os.replace`` — no bytes copied. Across volumes
+    (``EXDEV``): ``shutil.copy2`` (sendfile/CopyFileEx under the hood) then
+    unlink. Returns True if the move was a rename.
+    """
+    try:
+        os.replace(src, dst)
+        return True
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+    if os.path.isdir(src):
+        shutil.move(str(src), str(dst))
+    else:
+        shutil.copy2(src, dst)
+        os.unlink(src)
+    return False
+
+
+def resolve_checksum_algorithm(preferred: str = CHECKSUM_ALGORITHM) -> str:
+    """Return *preferred*, or ``"sha256"`` if it needs a package that is missing."""
+    if preferred == "blake3" and _blake3 is None:
+        return "sha256"
+    return preferred
+
+
+def tagged_checksum(path: Path, algorithm: str = CHECKSUM_ALGORITHM) -> str | None:
+    """Checksum *path* and prefix the algorithm tag, e.g. ``"b3:<hex>"``.
+
+    This is the form stored in ``action_log`` so each row records how it
+    was hashed and stays verifiable if the default algorithm changes.
+    """
+    algorithm = resolve_checksum_algorithm(algorithm)
+    digest = file_checksum(path, algorithm)
+    if digest is None:
+        return None
+    return f"{_CHECKSUM_TAGS.get(algorithm, algorithm)}:{digest}"
+
+
+def verify_checksum(path: str | Path, stored: str) -> bool | None:
+    """Check *path* against a stored (tagged or legacy) checksum.
+
+    Returns None when the file can't be read or the algorithm isn't available.
+    """
+    tag, sep, expected = stored.partition(":")
+    if not sep:
+        tag, expected = "sha256", stored  # rows logged before tagging
+    algorithm = _TAG_ALGORITHMS.get(tag, tag)
+    if resolve_checksum_algorithm(algorithm) != algorithm:
+        return None
+    actual = file_checksum(path, algorithm)
+    return None if actual is None else actual == expected
+
+
 class UndoManager:
     """Manages action logging and rollback operations.
 
@@ -74,13 +186,46 @@ class UndoManager:
     ) -> None:
         self.db = db
         self.trash_dir = trash_dir
+        # Directories already created this batch — files mostly share parents
+        self._created_dirs: set[str] = set()
+        # Names taken in each batch's trash folder (os.path.normcase'd)
+        self._trash_names: dict[str, set[str]] = {}
+
+    def checksum_many(
+        self,
+        paths: list[Path],
+        *,
+        algorithm: str = CHECKSUM_ALGORITHM,
+        max_workers: int | None = CHECKSUM_WORKERS,
+    ) -> dict[Path, str | None]:
+        """Tagged checksums for many files, hashed concurrently.
+
+        Hashing releases the GIL, so a small thread pool keeps several disk
+        requests in flight. Pass ``max_workers=1`` for a spinning disk, where
+        concurrent reads only add seeks.
+        """
+        if not paths:
+            return {}
+        workers = max_workers or min(8, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            digests = pool.map(lambda p: tagged_checksum(p, algorithm), paths)
+            return dict(zip(paths, digests))
 
     def new_batch(self) -> str:
         """Create a new batch ID."""
         batch_id = generate_batch_id()
+        self._created_dirs.clear()
+        self._trash_names.clear()
         logger.info("New undo batch: %s", batch_id)
         return batch_id
 
+    def ensure_dir(self, path: str | Path) -> None:
+        """``mkdir -p`` *path*, at most once per batch."""
+        key = os.fspath(path) or "."  # dirname() of a bare filename
+        if key not in self._created_dirs:
+            os.makedirs(key, exist_ok=True)
+            self._created_dirs.add(key)
+
     def log_action(
         self,
         file_id: int | None,
@@ -92,34 +237,141 @@ class UndoManager:
         checksum_after: str | None = None,
     ) -> int:
         """Log an action to the action_log table. Returns the log entry ID."""
-        sql = """
-        INSERT INTO action_log
-            (file_id, action, source_path, dest_path, checksum_before,
-             checksum_after, batch_id)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        """
-        with self.db.transaction() as cur:
-            cur.execute(sql, (
-                file_id, action, source_path, dest_path,
-                checksum_before, checksum_after, batch_id,
-            ))
-            log_id = cur.lastrowid
+        (log_id,) = self.log_actions_bulk([(
+            file_id, action, source_path, dest_path,
+            checksum_before, checksum_after, batch_id,
+        )])
         logger.debug(
             "Logged action #%d: %s %s -> %s (batch=%s)",
             log_id, action, source_path, dest_path, batch_id,
         )
-        return log_id  # type: ignore[return-value]
+        return log_id
 
-    def get_batch_actions(self, batch_id: str) -> list[dict[str, Any]]:
-        """Get all actions in a batch, ordered for undo (reverse execution order)."""
-        sql = """
-        SELECT * FROM action_log
+    def log_actions_bulk(self, rows: list[ActionRow]) -> list[int]:
+        """Log many actions in one transaction. Returns their log entry IDs.
+
+        Each row is ``(file_id, action, source_path, dest_path,
+        checksum_before, checksum_after, batch_id)``. One commit for the
+        whole list instead of one per action.
+        """
+        if not rows:
+            return []
+        with self.db.transaction() as cur:
+            cur.executemany(_INSERT_ACTION_SQL, rows)
+            # AUTOINCREMENT ids from a single statement in one transaction are
+            # contiguous; executemany leaves lastrowid unset, so ask SQLite.
+            last_id = cur.execute("SELECT last_insert_rowid()").fetchone()[0]
+        first_id = last_id - len(rows) + 1
+        logger.debug("Logged %d actions (#%d–#%d)", len(rows), first_id, last_id)
+        return list(range(first_id, last_id + 1))
+
+    def set_checksums_after(self, rows: list[tuple[str, int]]) -> None:
+        """Record ``(checksum_after, log_id)`` pairs in one transaction."""
+        if not rows:
+            return
+        with self.db.transaction() as cur:
+            cur.executemany("UPDATE action_log SET checksum_after = ? WHERE id = ?", rows)
+
+    def discard_actions(self, log_ids: list[int]) -> None:
+        """Delete log rows written ahead of operations that then failed.
+
+        Unlike undo, which keeps rows and marks them, these describe work that
+        never happened, so they are removed from the history.
+        """
+        if not log_ids:
+            return
+        chunk = 500  # stay well under SQLite's bound-variable limit
+        with self.db.transaction() as cur:
+            for start in range(0, len(log_ids), chunk):
+                ids = log_ids[start:start + chunk]
+                placeholders = ",".join("?" * len(ids))
+                cur.execute(f"DELETE FROM action_log WHERE id IN ({placeholders})", ids)
+        logger.debug("Discarded %d log rows for failed operations", len(log_ids))
+
+    def delete_many_to_trash(
+        self,
+        items: list[tuple[int | None, Path]],
+        batch_id: str,
+        *,
+        checksums: dict[Path, str | None] | None = None,
+        max_workers: int = 4,
+    ) -> list[tuple[int | None, Path, Path]]:
+        """Move many files into this batch's trash and log them as DELETED.
+
+        Trash paths are reserved up front and every planned move is logged
+        in one transaction *before* any file moves, so an interrupted batch
+        stays undoable. The moves then run on a small thread pool (same
+        volume: each is a metadata-only rename) and the rows of moves that
+        failed are discarded. *checksums* maps source paths to pre-computed
+        tagged checksums; when omitted they are hashed here.
+
+        Returns the ``(file_id, source, trash_path)`` entries that moved.
+        Failed moves are logged and left out.
+        """
+        if not items:
+            return []
+        if checksums is None:
+            checksums = self.checksum_many([p for _, p in items if p.is_file()])
+
+        planned = [(fid, src, self.get_trash_path(src, batch_id)) for fid, src in items]
+        self.ensure_dir(self.trash_dir / batch_id)
+        log_ids = self.log_actions_bulk([
+            (fid, "DELETED", str(src), str(dst), checksums.get(src), None, batch_id)
+            for fid, src, dst in planned
+        ])
+
+        def _move(entry: tuple[int | None, Path, Path]) -> bool:
+            _, src, dst = entry
+            try:
+                fast_move(src, dst)
+                return True
+            except OSError as exc:
+                logger.error("Could not move %s to trash: %s", src, exc)
+                return False
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_move, planned))
+
+        moved = [e for e, ok in zip(planned, results) if ok]
+        self.discard_actions([i for i, ok in zip(log_ids, results) if not ok])
+        logger.info("Moved %d/%d files to trash for batch %s", len(moved), len(items), batch_id)
+        return moved
+
+    def get_batch_actions(
+        self, batch_id: str, *, include_checksums: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Get all actions in a batch, ordered for undo (reverse execution order).
+
+        The two checksum columns are only decoded when *include_checksums*
+        is set; listing a batch does not need them.
+        """
+        columns = _ACTION_COLUMNS
+        if include_checksums:
+            columns += ", checksum_before, checksum_after"
+        sql = f"""
+        SELECT {columns} FROM action_log
         WHERE batch_id = ? AND undone = 0
         ORDER BY id DESC
         """
         rows = self.db.conn.execute(sql, (batch_id,)).fetchall()
         return [dict(row) for row in rows]
 
+    def get_batch_actions_with_files(self, batch_id: str) -> list[dict[str, Any]]:
+        """Like :meth:`get_batch_actions`, plus the scanned file's size and path.
+
+        One LEFT JOIN instead of a ``files`` lookup per action; ``file_size``
+        and ``file_path`` are None for actions without a file row.
+        """
+        sql = """
+        SELECT al.*, f.size_bytes AS file_size, f.path AS file_path
+        FROM action_log al
+        LEFT JOIN files f ON f.id = al.file_id
+        WHERE al.batch_id = ? AND al.undone = 0
+        ORDER BY al.id DESC
+        """
+        rows = self.db.conn.execute(sql, (batch_id,)).fetchall()
+        return [dict(row) for row in rows]
+
     def get_recent_batches(self, limit: int = 10) -> list[dict[str, Any]]:
         """Get recent batch IDs with action counts."""
         sql = """
@@ -141,7 +393,8 @@ class UndoManager:
 
         Returns summary with counts of undone, skipped, and failed actions.
         """
-        actions = self.get_batch_actions(batch_id)
+        actions = self.get_batch_actions_with_files(batch_id)
+        self._created_dirs.clear()  # directories may have changed since
         if not actions:
             logger.warning("No undoable actions found for batch %s", batch_id)
             return {"undone": 0, "skipped": 0, "failed": 0}
@@ -154,17 +407,24 @@ class UndoManager:
         undone = 0
         skipped = 0
         failed = 0
-
-        for entry in actions:
-            try:
-                success = self._undo_single(entry, dry_run=dry_run)
-                if success:
-                    undone += 1
-                else:
-                    skipped += 1
-            except Exception:
-                logger.exception("Failed to undo action #%d", entry["id"])
-                failed += 1
+        done_ids: list[int] = []
+
+        try:
+            for entry in actions:
+                try:
+                    success = self._undo_single(entry, dry_run=dry_run)
+                    if success:
+                        undone += 1
+                        if not dry_run:
+                            done_ids.append(entry["id"])
+                    else:
+                        skipped += 1
+                except Exception:
+                    logger.exception("Failed to undo action #%d", entry["id"])
+                    failed += 1
+        finally:
+            # One UPDATE for the batch; still runs if the loop is interrupted
+            self._mark_undone(done_ids)
 
         summary = {"undone": undone, "skipped": skipped, "failed": failed}
         logger.info("Undo batch %s complete: %s", batch_id, summary)
@@ -173,14 +433,23 @@ class UndoManager:
     def _undo_single(self, entry: dict[str, Any], *, dry_run: bool = False) -> bool:
         """Undo a single logged action. Returns True if undone."""
         action = entry["action"]
-        source = Path(entry["source_path"])
-        dest = Path(entry["dest_path"]) if entry["dest_path"] else None
+        # Paths stay as the stored strings; only the symlink case needs Path.
+        source: str = entry["source_path"]
+        dest: str | None = entry["dest_path"] or None
         log_id = entry["id"]
 
-        logger.debug("Undoing action #%d: %s", log_id, action)
+        if entry.get("file_size") is not None:
+            logger.debug(
+                "Undoing action #%d: %s (%s)", log_id, action, format_bytes(entry["file_size"]),
+            )
+        else:
+            logger.debug("Undoing action #%d: %s", log_id, action)
 
         if action == "MOVED":
-            return self._undo_move(log_id, source, dest, dry_run=dry_run)
+            return self._undo_move(
+                log_id, source, dest, dry_run=dry_run,
+                checksum=entry.get("checksum_before"),
+            )
         elif action == "DELETED":
             return self._undo_delete(log_id, source, dest, dry_run=dry_run)
         elif action == "ARCHIVED":
@@ -192,51 +461,76 @@ class UndoManager:
             return False
 
     def _undo_move(
-        self, log_id: int, source: Path, dest: Path | None, *, dry_run: bool,
+        self, log_id: int, source: str, dest: str | None, *, dry_run: bool,
+        checksum: str | None = None,
     ) -> bool:
-        """Undo a move: move file back from dest to source."""
-        if dest is None or not dest.exists():
+        """Undo a move: move file back from dest to source.
+
+        When the move logged a checksum, the file is re-verified first; a
+        mismatch is reported but the file is still restored. A file that
+        now occupies *source* is never overwritten.
+        """
+        if dest is None or not os.path.exists(dest):
             logger.warning("Cannot undo move #%d — dest %s not found", log_id, dest)
             return False
 
+        self._refuse_overwrite(log_id, source)
+
+        if checksum and os.path.isfile(dest) and verify_checksum(dest, checksum) is False:
+            logger.warning(
+                "Undo move #%d — %s changed since it was moved (checksum mismatch)",
+                log_id, dest,
+            )
+
         if not dry_run:
-            source.parent.mkdir(parents=True, exist_ok=True)
-            shutil.move(str(dest), str(source))
-            self._mark_undone(log_id)
+            self.ensure_dir(os.path.dirname(source))
+            fast_move(dest, source)
         logger.info("Undo move: %s -> %s%s", dest, source, " (dry)" if dry_run else "")
         return True
 
     def _undo_delete(
-        self, log_id: int, source: Path, dest: Path | None, *, dry_run: bool,
+        self, log_id: int, source: str, dest: str | None, *, dry_run: bool,
     ) -> bool:
         """Undo a delete: restore from trash (dest) back to source."""
-        if dest is None or not dest.exists():
+        if dest is None or not os.path.exists(dest):
             logger.warning("Cannot undo delete #%d — trash copy %s not found", log_id, dest)
             return False
 
+        self._refuse_overwrite(log_id, source)
+
         if not dry_run:
-            source.parent.mkdir(parents=True, exist_ok=True)
-            shutil.move(str(dest), str(source))
-            self._mark_undone(log_id)
+            self.ensure_dir(os.path.dirname(source))
+            fast_move(dest, source)
         logger.info("Undo delete: restored %s%s", source, " (dry)" if dry_run else "")
         return True
 
+    @staticmethod
+    def _refuse_overwrite(log_id: int, source: str) -> None:
+        """Fail a restore whose original path has been re-created since.
+
+        ``fast_move`` renames with ``os.replace``, which would silently
+        replace the newer file; the action is counted as failed instead.
+        """
+        if os.path.exists(source):
+            raise FileExistsError(
+                errno.EEXIST, f"Cannot undo #{log_id} — {source} already exists", source,
+            )
+
     def _undo_archive(
-        self, log_id: int, source: Path, dest: Path | None, *, dry_run: bool,
+        self, log_id: int, source: str, dest: str | None, *, dry_run: bool,
     ) -> bool:
         """Undo an archive: remove the archive file (originals are kept)."""
-        if dest is None or not dest.exists():
+        if dest is None or not os.path.exists(dest):
             logger.warning("Cannot undo archive #%d — archive %s not found", log_id, dest)
             return False
 
         if not dry_run:
-            dest.unlink()
-            self._mark_undone(log_id)
+            os.unlink(dest)
         logger.info("Undo archive: removed %s%s", dest, " (dry)" if dry_run else "")
         return True
 
     def _undo_symlink(
-        self, log_id: int, source: Path, dest: Path | None, *, dry_run: bool,
+        self, log_id: int, source: str, dest: str | None, *, dry_run: bool,
     ) -> bool:
         """Undo a symlink/junction: remove junction, move data back."""
         if dest is None:
@@ -245,18 +539,17 @@ class UndoManager:
 
         if not dry_run:
             # Remove the junction at source (if it exists and is a junction)
-            if source.exists():
-                if source.is_symlink() or source.is_junction():
-                    source.unlink()
-                elif source.is_dir():
+            link = Path(source)
+            if link.exists():
+                if link.is_symlink() or link.is_junction():
+                    link.unlink()
+                elif link.is_dir():
                     # Junction might show as dir on some systems
-                    source.rmdir()
+                    link.rmdir()
 
             # Move data back from dest to source
-            if dest.exists():
-                shutil.move(str(dest), str(source))
-
-            self._mark_undone(log_id)
+            if os.path.exists(dest):
+                fast_move(dest, source)
 
         logger.info(
             "Undo symlink: removed junction %s, restored from %s%s",
@@ -264,23 +557,42 @@ class UndoManager:
         )
         return True
 
-    def _mark_undone(self, log_id: int) -> None:
-        """Mark an action log entry as undone."""
-        sql = "UPDATE action_log SET undone = 1 WHERE id = ?"
+    def _mark_undone(self, log_ids: list[int]) -> None:
+        """Mark action log entries as undone in a single transaction."""
+        if not log_ids:
+            return
+        chunk = 500  # stay well under SQLite's bound-variable limit
         with self.db.transaction() as cur:
-            cur.execute(sql, (log_id,))
+            for start in range(0, len(log_ids), chunk):
+                ids = log_ids[start:start + chunk]
+                placeholders = ",".join("?" * len(ids))
+                cur.execute(
+                    f"UPDATE action_log SET undone = 1 WHERE id IN ({placeholders})",
+                    ids,
+                )
 
     def get_trash_path(self, original_path: Path, batch_id: str) -> Path:
         """Compute the trash path for a file being 'deleted'.
 
         Files go to: <trash_dir>/<batch_id>/<original_filename>
-        Handles name collisions by appending a counter.
+        Handles name collisions by appending a counter. The returned name is
+        reserved for this batch, so repeated calls never hand out the same path.
         """
         base = self.trash_dir / batch_id
-        dest = base / original_path.name
+        taken = self._trash_names.get(batch_id)
+        if taken is None:
+            # One listing per batch; collisions are then resolved in memory
+            try:
+                taken = {os.path.normcase(n) for n in os.listdir(base)}
+            except FileNotFoundError:
+                taken = set()
+            self._trash_names[batch_id] = taken
+
         # Handle name collisions (same filename from different directories)
+        name = original_path.name
         counter = 1
-        while dest.exists():
-            dest = base / f"{original_path.stem}_{counter}{original_path.suffix}"
+        while os.path.normcase(name) in taken:
+            name = f"{original_path.stem}_{counter}{original_path.suffix}"
             counter += 1
-        return dest
+        taken.add(os.path.normcase(name))
+        return base / name
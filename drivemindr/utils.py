@@ -6,19 +6,28 @@ No network calls. No external dependencies beyond the standard library.
 
 from __future__ import annotations
 
+import functools
+import logging
 import time
 from typing import Callable
 
+_timing_log = logging.getLogger("drivemindr.timing")
+
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+# 1024**i for each unit above, so formatting never recomputes a power
+_BYTE_DIVISORS = tuple(1 << (10 * i) for i in range(len(_BYTE_UNITS)))
+_TOP_UNIT = len(_BYTE_UNITS) - 1
+
 
 def format_bytes(n: int) -> str:
     """Human-readable byte string: ``1234567`` → ``1.18 MB``."""
-    if n < 0:
-        return f"-{format_bytes(-n)}"
-    for unit in ("B", "KB", "MB", "GB", "TB"):
-        if abs(n) < 1024.0:
-            return f"{n:.2f} {unit}" if unit != "B" else f"{n} B"
-        n /= 1024.0  # type: ignore[assignment]
-    return f"{n:.2f} PB"
+    sign = "-" if n < 0 else ""
+    n = abs(int(n))
+    if n < 1024:
+        return f"{sign}{n} B"
+    # bit_length picks the unit directly: every 10 bits is one 1024 step
+    idx = min((n.bit_length() - 1) // 10, _TOP_UNIT)
+    return f"{sign}{n / _BYTE_DIVISORS[idx]:.2f} {_BYTE_UNITS[idx]}"
 
 
 def format_count(n: int) -> str:
@@ -34,14 +43,14 @@ def timed(label: str | None = None) -> Callable:
         @timed("scan phase")
         def scan_drive(...): ...
     """
-    import functools
-    import logging
-
-    log = logging.getLogger("drivemindr.timing")
+    log = _timing_log
 
     def decorator(fn: Callable) -> Callable:
         @functools.wraps(fn)
         def wrapper(*args, **kwargs):
+            # No clock reads or formatting unless DEBUG timing is enabled
+            if not log.isEnabledFor(logging.DEBUG):
+                return fn(*args, **kwargs)
             start = time.perf_counter()
             result = fn(*args, **kwargs)
             elapsed = time.perf_counter() - start
@@ -52,5 +61,11 @@ def timed(label: str | None = None) -> Callable:
 
 
 def clamp(value: float, low: float = 0.0, high: float = 1.0) -> float:
-    """Clamp *value* between *low* and *high*."""
-    return max(low, min(high, value))
+    """Clamp *value* between *low* and *high*.
+
+    Two comparisons rather than ``max(low, min(high, value))``: same result
+    (NaN still comes back as *high*) without two builtin calls.
+    """
+    if not value <= high:
+        return high
+    return low if value < low else value
@@ -25,10 +25,10 @@ _project_root = str(Path(__file__).resolve().parent.parent)
 if _project_root not in sys.path:
     sys.path.insert(0, _project_root)
 
-from drivemindr.classifier import OllamaClient
 from drivemindr.config import OLLAMA_HOST, OLLAMA_MODEL
-from drivemindr.network import check_outbound_connections, get_network_interfaces
-from drivemindr.symlinks import is_admin
+
+# Heavier modules (classifier, network/psutil, symlinks) are imported inside
+# the checks that use them so the wizard banner prints immediately.
 
 
 def _print_check(label: str, passed: bool, detail: str = "") -> None:
@@ -66,11 +66,31 @@ def check_platform() -> bool:
     return True
 
 
+def _port_open(host: str, port: int, timeout: float = 0.2) -> bool:
+    """TCP connect probe — True if something is listening on host:port."""
+    import socket
+
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
 def check_ollama() -> tuple[bool, bool]:
     """Check if Ollama is installed and the model is available."""
+    from urllib.parse import urlsplit
+
+    from drivemindr.classifier import OllamaClient
+
     client = OllamaClient(host=OLLAMA_HOST, model=OLLAMA_MODEL)
 
-    ollama_up = client.is_available()
+    # Fail fast when nothing listens on the port; only then pay for HTTP
+    url = urlsplit(OLLAMA_HOST)
+    ollama_up = (
+        _port_open(url.hostname or "127.0.0.1", url.port or 11434)
+        and client.is_available()
+    )
     _print_check(
         "Ollama running",
         ollama_up,
@@ -95,23 +115,38 @@ def check_ollama() -> tuple[bool, bool]:
     return ollama_up, model_ready
 
 
+def _probe_drive(letter: str) -> tuple[str, bool, str]:
+    """Stat one drive root. Returns ``(letter, exists, detail)``."""
+    import shutil
+
+    path = Path(f"{letter}:\\")
+    if not path.exists():
+        return letter, False, ""
+    try:
+        usage = shutil.disk_usage(str(path))
+        free_gb = usage.free / (1024 ** 3)
+        total_gb = usage.total / (1024 ** 3)
+        detail = f"{free_gb:.1f} GB free / {total_gb:.1f} GB total"
+    except OSError:
+        detail = "accessible"
+    return letter, True, detail
+
+
 def check_drives() -> dict[str, bool]:
     """Check for available drives (Windows-specific)."""
     drives: dict[str, bool] = {}
 
     if platform.system() == "Windows":
-        for letter in ["C", "D", "E", "F"]:
-            path = Path(f"{letter}:\\")
-            exists = path.exists()
+        from concurrent.futures import ThreadPoolExecutor
+
+        # A cold or external drive can take hundreds of ms to answer; probe
+        # all letters at once and report in the original order.
+        letters = ["C", "D", "E", "F"]
+        with ThreadPoolExecutor(max_workers=len(letters)) as pool:
+            results = list(pool.map(_probe_drive, letters))
+
+        for letter, exists, detail in results:
             if exists:
-                try:
-                    import shutil
-                    usage = shutil.disk_usage(str(path))
-                    free_gb = usage.free / (1024 ** 3)
-                    total_gb = usage.total / (1024 ** 3)
-                    detail = f"{free_gb:.1f} GB free / {total_gb:.1f} GB total"
-                except OSError:
-                    detail = "accessible"
                 drives[letter] = True
                 _print_check(f"Drive {letter}:", True, detail)
             elif letter in ("C", "D"):
@@ -130,6 +165,8 @@ def check_drives() -> dict[str, bool]:
 
 def check_admin() -> bool:
     """Check for Administrator privileges."""
+    from drivemindr.symlinks import is_admin
+
     admin = is_admin()
     _print_check(
         "Administrator privileges",
@@ -141,6 +178,8 @@ def check_admin() -> bool:
 
 def check_network() -> bool:
     """Verify no suspicious outbound connections."""
+    from drivemindr.network import check_outbound_connections, get_network_interfaces
+
     result = check_outbound_connections()
     _print_check(
         "Network isolation",
@@ -163,24 +202,28 @@ def check_network() -> bool:
 
 
 def check_dependencies() -> bool:
-    """Check that required Python packages are installed."""
+    """Check that required Python packages are installed.
+
+    Uses ``find_spec`` so packages are located without being imported —
+    importing streamlit just to print a checkmark takes most of a second.
+    """
+    from importlib.util import find_spec
+
     required = ["typer", "rich", "psutil"]
     optional = ["streamlit"]
     all_ok = True
 
     for pkg in required:
-        try:
-            __import__(pkg)
+        if find_spec(pkg) is not None:
             _print_check(f"Package '{pkg}'", True, "installed")
-        except ImportError:
+        else:
             _print_check(f"Package '{pkg}'", False, "missing — pip install drivemindr")
             all_ok = False
 
     for pkg in optional:
-        try:
-            __import__(pkg)
+        if find_spec(pkg) is not None:
             _print_check(f"Package '{pkg}' (optional)", True, "installed")
-        except ImportError:
+        else:
             _print_check(
                 f"Package '{pkg}' (optional)",
                 True,  # optional, so still OK
@@ -0,0 +1,64 @@
+"""Shared pytest fixtures."""
+
+import shutil
+import sqlite3
+from typing import Callable
+
+import pytest
+
+from drivemindr.database import Database
+
+
+@pytest.fixture(scope="session")
+def schema_template() -> Database:
+    """An empty, schema-initialized in-memory database built once per session."""
+    template = Database(":memory:")
+    template.connect()
+    # Planner statistics travel with the pages into every clone
+    template.conn.execute("ANALYZE")
+    yield template
+    template.close()
+
+
+@pytest.fixture(scope="session")
+def clone_template(schema_template: Database) -> Callable[[], Database]:
+    """Factory for fresh in-memory databases cloned page-for-page from the template.
+
+    Usable from fixtures of any scope; each call returns a new database.
+    """
+    def _clone() -> Database:
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        schema_template.conn.backup(conn)
+        return Database.from_connection(conn)
+
+    return _clone
+
+
+@pytest.fixture
+def memory_db(clone_template: Callable[[], Database]) -> Database:
+    """A fresh in-memory database cloned from the template."""
+    # No close() on teardown: an in-memory connection is freed when collected
+    return clone_template()
+
+
+@pytest.fixture(scope="session")
+def schema_template_file(tmp_path_factory) -> str:
+    """An empty, schema-initialized database file built once per session."""
+    path = tmp_path_factory.mktemp("template") / "template.db"
+    template = Database(path)
+    template.connect()
+    template.conn.execute("ANALYZE")
+    # Closing the last connection checkpoints the WAL into the main file
+    template.close()
+    return str(path)
+
+
+@pytest.fixture
+def file_db(schema_template_file: str, tmp_path) -> Database:
+    """A fresh on-disk database copied from the template file."""
+    path = tmp_path / "test.db"
+    shutil.copyfile(schema_template_file, path)
+    database = Database(path)
+    database.connect()
+    yield database
+    database.close()
@@ -5,9 +5,11 @@ All tests use mocked Ollama responses — no network calls, no Ollama required.
 Covers: response parsing, safety integration, batch processing, error handling.
 """
 
-import json
+import urllib.error
+from collections import deque
 from unittest.mock import MagicMock, patch
 
+import orjson
 import pytest
 
 from drivemindr.classifier import (
@@ -17,6 +19,7 @@ from drivemindr.classifier import (
     _build_batch_prompt,
     _parse_response,
 )
+from drivemindr.config import OLLAMA_BATCH_SIZE
 from drivemindr.database import Database
 from drivemindr.safety import SafetyEngine
 
@@ -26,9 +29,15 @@ from drivemindr.safety import SafetyEngine
 # ---------------------------------------------------------------------------
 
 @pytest.fixture
-def db(tmp_path) -> Database:
-    database = Database(tmp_path / "test.db")
-    database.connect()
+def db(memory_db) -> Database:
+    # In-memory clone of the session schema template (see conftest.py)
+    return memory_db
+
+
+@pytest.fixture(scope="module")
+def shared_db(clone_template) -> Database:
+    """One in-memory database shared by the module's classifier harness."""
+    database = clone_template()
     yield database
     database.close()
 
@@ -51,89 +60,134 @@ def _insert_test_file(db: Database, path: str, name: str, ext: str, size: int =
     })
 
 
+def _bulk_insert_test_files(db: Database, rows: list[tuple[str, str, str, int]]) -> None:
+    """Insert many (path, name, ext, size) test file records in one transaction."""
+    db.bulk_upsert_files([
+        {
+            "path": path,
+            "name": name,
+            "extension": ext,
+            "size_bytes": size,
+            "created": "2024-01-01T00:00:00",
+            "modified": "2024-06-01T00:00:00",
+            "accessed": "2024-12-01T00:00:00",
+            "owner": "TestUser",
+            "is_readonly": 0,
+            "is_dir": 0,
+            "parent_dir": "C:\\Users\\test",
+            "scan_id": "test001",
+        }
+        for path, name, ext, size in rows
+    ])
+
+
 def _make_ai_response(items: list[dict]) -> str:
     """Build a mock Ollama JSON response string."""
-    return json.dumps(items)
+    return orjson.dumps(items).decode()
+
+
+# Canned response shapes, filled with str.format instead of serializing
+# the whole item list; only the path itself is JSON-encoded.
+_KEEP_TEMPLATE = (
+    '{{"path": {path}, "action": "KEEP", "confidence": 0.9, '
+    '"reason": "ok", "category": "x"}}'
+)
+_MOVE_DATA_TEMPLATE = (
+    '{{"path": {path}, "action": "MOVE_DATA", "confidence": 0.85, '
+    '"reason": "data file", "category": "data"}}'
+)
+
+
+def _canned_response(template: str, paths: list[str]) -> str:
+    return "[" + ", ".join(template.format(path=orjson.dumps(p).decode()) for p in paths) + "]"
+
+
+# classify_all over file0..file4.dat with batch_size=2 → batches of [2, 2, 1]
+_MOVE_DATA_BATCHES: list[str] = [
+    _canned_response(_MOVE_DATA_TEMPLATE, [f"C:\\file{i}.dat" for i in batch])
+    for batch in (range(2), range(2, 4), range(4, 5))
+]
 
 
 # ---------------------------------------------------------------------------
 # Response parsing
 # ---------------------------------------------------------------------------
 
-class TestParseResponse:
+# Model outputs for the parser tests, built once at import
+def _one_item(action: str, confidence: object, reason: str, category: str = "x") -> str:
+    return _make_ai_response([
+        {"path": "C:\\a.txt", "action": action, "confidence": confidence,
+         "reason": reason, "category": category},
+    ])
+
+
+_ONE_KEEP_DOCUMENT = _one_item("KEEP", 0.9, "User document", "document")
+_ONE_MOVE = _one_item("MOVE_DATA", 0.8, "move it", "data")
+_ONE_KEEP = _one_item("KEEP", 0.9, "ok")
+_ONE_BAD_ACTION = _one_item("YEET", 0.9, "bad action")
+_ONE_BAD_CONFIDENCE = _one_item("KEEP", "not_a_number", "bad conf")
+_ONE_OVER_CONFIDENT = _one_item("KEEP", 1.5, "over 1")
+_FIVE_KEEPS = _make_ai_response([
+    {"path": f"C:\\file{i}.txt", "action": "KEEP", "confidence": 0.9,
+     "reason": "ok", "category": "x"}
+    for i in range(5)
+])
+
+
+_PARSE_CASES = [
+    pytest.param(
+        _ONE_KEEP_DOCUMENT, 1,
+        lambda r: len(r) == 1 and r[0].action == "KEEP" and r[0].confidence == 0.9,
+        id="valid_json_array",
+    ),
+    pytest.param(
+        "```json\n" + _ONE_MOVE + "\n```", 1,
+        lambda r: len(r) == 1 and r[0].action == "MOVE_DATA",
+        id="strips_markdown_fences",
+    ),
+    pytest.param(
+        '[{"path":"C:\\\\a.txt","action":"KEEP","confidence":0.9,"reason":"ok","category":"x"},]', 1,
+        lambda r: len(r) == 1,
+        id="handles_trailing_comma",
+    ),
+    pytest.param(
+        _ONE_BAD_ACTION, 1, lambda r: r[0].action == "KEEP",
+        id="invalid_action_defaults_to_keep",
+    ),
+    pytest.param(
+        _ONE_BAD_CONFIDENCE, 1, lambda r: r[0].confidence == 0.0,
+        id="invalid_confidence_defaults_to_zero",
+    ),
+    pytest.param(
+        _ONE_OVER_CONFIDENT, 1, lambda r: r[0].confidence == 1.0,
+        id="clamps_confidence",
+    ),
+    pytest.param(
+        "this is not json at all", 1, lambda r: r == [],
+        id="completely_invalid_json_returns_empty",
+    ),
+    pytest.param(
+        '{"not": "an array"}', 1, lambda r: r == [],
+        id="json_not_array_returns_empty",
+    ),
+    pytest.param(
+        "Here is my classification:\n" + _ONE_KEEP + "\nDone!", 1,
+        lambda r: len(r) == 1,
+        id="extracts_json_from_surrounding_text",
+    ),
+    pytest.param(
+        _FIVE_KEEPS, 5, lambda r: len(r) == 5,
+        id="multiple_items",
+    ),
+]
 
-    def test_valid_json_array(self) -> None:
-        text = json.dumps([
-            {"path": "C:\\a.txt", "action": "KEEP", "confidence": 0.9,
-             "reason": "User document", "category": "document"},
-        ])
-        results = _parse_response(text, 1)
-        assert len(results) == 1
-        assert results[0].action == "KEEP"
-        assert results[0].confidence == 0.9
-
-    def test_strips_markdown_fences(self) -> None:
-        text = "```json\n" + json.dumps([
-            {"path": "C:\\a.txt", "action": "MOVE_DATA", "confidence": 0.8,
-             "reason": "move it", "category": "data"},
-        ]) + "\n```"
-        results = _parse_response(text, 1)
-        assert len(results) == 1
-        assert results[0].action == "MOVE_DATA"
-
-    def test_handles_trailing_comma(self) -> None:
-        text = '[{"path":"C:\\\\a.txt","action":"KEEP","confidence":0.9,"reason":"ok","category":"x"},]'
-        results = _parse_response(text, 1)
-        assert len(results) == 1
-
-    def test_invalid_action_defaults_to_keep(self) -> None:
-        text = json.dumps([
-            {"path": "C:\\a.txt", "action": "YEET", "confidence": 0.9,
-             "reason": "bad action", "category": "x"},
-        ])
-        results = _parse_response(text, 1)
-        assert results[0].action == "KEEP"
 
-    def test_invalid_confidence_defaults_to_zero(self) -> None:
-        text = json.dumps([
-            {"path": "C:\\a.txt", "action": "KEEP", "confidence": "not_a_number",
-             "reason": "bad conf", "category": "x"},
-        ])
-        results = _parse_response(text, 1)
-        assert results[0].confidence == 0.0
+class TestParseResponse:
 
-    def test_clamps_confidence(self) -> None:
-        text = json.dumps([
-            {"path": "C:\\a.txt", "action": "KEEP", "confidence": 1.5,
-             "reason": "over 1", "category": "x"},
-        ])
-        results = _parse_response(text, 1)
-        assert results[0].confidence == 1.0
-
-    def test_completely_invalid_json_returns_empty(self) -> None:
-        results = _parse_response("this is not json at all", 1)
-        assert results == []
-
-    def test_json_not_array_returns_empty(self) -> None:
-        results = _parse_response('{"not": "an array"}', 1)
-        assert results == []
-
-    def test_extracts_json_from_surrounding_text(self) -> None:
-        text = 'Here is my classification:\n' + json.dumps([
-            {"path": "C:\\a.txt", "action": "KEEP", "confidence": 0.9,
-             "reason": "ok", "category": "x"},
-        ]) + '\nDone!'
-        results = _parse_response(text, 1)
-        assert len(results) == 1
-
-    def test_multiple_items(self) -> None:
-        items = [
-            {"path": f"C:\\file{i}.txt", "action": "KEEP", "confidence": 0.9,
-             "reason": "ok", "category": "x"}
-            for i in range(5)
-        ]
-        results = _parse_response(json.dumps(items), 5)
-        assert len(results) == 5
+    @pytest.mark.parametrize(("text", "expected_count", "check"), _PARSE_CASES)
+    def test_parse(self, text: str, expected_count: int, check) -> None:
+        results = _parse_response(text, expected_count)
+        assert check(results), results
 
 
 # ---------------------------------------------------------------------------
@@ -165,14 +219,21 @@ class TestBuildBatchPrompt:
 # OllamaClient (mocked network)
 # ---------------------------------------------------------------------------
 
+def _refuse_connection(*args, **kwargs):
+    """Stand-in for urlopen when Ollama is down — fails without touching a socket."""
+    raise urllib.error.URLError("connection refused")
+
+
 class TestOllamaClient:
 
-    def test_is_available_returns_false_when_down(self) -> None:
-        client = OllamaClient(host="http://127.0.0.1:99999")
+    def test_is_available_returns_false_when_down(self, monkeypatch) -> None:
+        monkeypatch.setattr("drivemindr.classifier.urllib.request.urlopen", _refuse_connection)
+        client = OllamaClient()
         assert client.is_available() is False
 
-    def test_has_model_returns_false_when_down(self) -> None:
-        client = OllamaClient(host="http://127.0.0.1:99999")
+    def test_has_model_returns_false_when_down(self, monkeypatch) -> None:
+        monkeypatch.setattr("drivemindr.classifier.urllib.request.urlopen", _refuse_connection)
+        client = OllamaClient()
         assert client.has_model() is False
 
     @patch("drivemindr.classifier.urllib.request.urlopen")
@@ -190,9 +251,9 @@ class TestOllamaClient:
     def test_has_model_returns_true(self, mock_urlopen) -> None:
         mock_resp = MagicMock()
         mock_resp.status = 200
-        mock_resp.read.return_value = json.dumps({
+        mock_resp.read.return_value = orjson.dumps({
             "models": [{"name": "llama3.1:8b"}]
-        }).encode()
+        })
         mock_resp.__enter__ = MagicMock(return_value=mock_resp)
         mock_resp.__exit__ = MagicMock(return_value=False)
         mock_urlopen.return_value = mock_resp
@@ -202,9 +263,9 @@ class TestOllamaClient:
 
     @patch("drivemindr.classifier.urllib.request.urlopen")
     def test_generate_returns_response_text(self, mock_urlopen) -> None:
-        response_body = json.dumps({"response": '[{"path":"C:\\\\a.txt","action":"KEEP","confidence":0.9,"reason":"ok","category":"x"}]'})
+        response_body = orjson.dumps({"response": '[{"path":"C:\\\\a.txt","action":"KEEP","confidence":0.9,"reason":"ok","category":"x"}]'})
         mock_resp = MagicMock()
-        mock_resp.read.return_value = response_body.encode()
+        mock_resp.read.return_value = response_body
         mock_resp.__enter__ = MagicMock(return_value=mock_resp)
         mock_resp.__exit__ = MagicMock(return_value=False)
         mock_urlopen.return_value = mock_resp
@@ -218,243 +279,198 @@ class TestOllamaClient:
 # FileClassifier — full pipeline with mocked Ollama
 # ---------------------------------------------------------------------------
 
-class TestFileClassifier:
+class _FakeOllama:
+    """Minimal OllamaClient stand-in — much cheaper to build than a MagicMock.
 
-    def _mock_ollama(self, responses: list[str]) -> OllamaClient:
-        """Create a mock OllamaClient that returns canned responses."""
-        client = MagicMock(spec=OllamaClient)
-        client.is_available.return_value = True
-        client.has_model.return_value = True
-        client.generate.side_effect = responses
-        return client
+    ``generate`` serves the queued responses in order, raising any that
+    are exceptions, and counts its calls in ``calls``.
+    """
 
-    def test_classify_batch_stores_results(self, db: Database) -> None:
-        path = r"C:\Users\test\installer.msi"
-        _insert_test_file(db, path, "installer.msi", ".msi", 50000)
-        files = db.get_files()
+    __slots__ = ("responses", "available", "model_ready", "calls")
 
-        ai_response = _make_ai_response([
-            {"path": path, "action": "DELETE_JUNK", "confidence": 0.95,
-             "reason": "Old installer", "category": "junk"},
-        ])
+    def __init__(
+        self,
+        responses: list[str | Exception] = (),
+        *,
+        available: bool = True,
+        model_ready: bool = True,
+    ) -> None:
+        self.responses: deque[str | Exception] = deque(responses)
+        self.available = available
+        self.model_ready = model_ready
+        self.calls = 0
 
-        client = self._mock_ollama([ai_response])
-        classifier = FileClassifier(db, ollama_client=client)
-        result = classifier.classify_batch_direct(files)
+    def is_available(self) -> bool:
+        return self.available
 
-        assert len(result) == 1
-        assert result[0]["action"] == "DELETE_JUNK"  # .msi is not guardian-protected
+    def has_model(self, model: str | None = None) -> bool:
+        return self.model_ready
 
-    def test_safety_overrides_document_delete(self, db: Database) -> None:
-        """AI says delete a .docx → safety must override to KEEP."""
-        path = r"C:\Users\test\report.docx"
-        _insert_test_file(db, path, "report.docx", ".docx")
-        files = db.get_files()
+    def generate(self, prompt: str, **kwargs) -> str:
+        self.calls += 1
+        response = self.responses.popleft()
+        if isinstance(response, Exception):
+            raise response
+        return response
 
-        ai_response = _make_ai_response([
-            {"path": path, "action": "DELETE_JUNK", "confidence": 0.99,
-             "reason": "Old document", "category": "document"},
-        ])
 
-        client = self._mock_ollama([ai_response])
-        classifier = FileClassifier(db, ollama_client=client)
-        result = classifier.classify_batch_direct(files)
+class _ClassifierHarness:
+    """One FileClassifier + fake client + database, reused across a module."""
 
-        assert len(result) == 1
-        assert result[0]["action"] == "KEEP"
-        assert result[0]["overridden"] == 1
-        assert "Guardian" in result[0]["override_reason"]
+    def __init__(self, db: Database) -> None:
+        self.db = db
+        self.client = _FakeOllama()
+        self.classifier = FileClassifier(db, ollama_client=self.client)
 
-    def test_safety_overrides_photo_delete(self, db: Database) -> None:
-        """AI says delete a .jpg → safety must override to KEEP."""
-        path = r"C:\Users\test\photo.jpg"
-        _insert_test_file(db, path, "photo.jpg", ".jpg")
-        files = db.get_files()
+    def reset(self) -> None:
+        """Empty the database and return the classifier to its initial state."""
+        self.db.conn.executescript("DELETE FROM classifications; DELETE FROM files;")
+        self.set_responses([])
+        self.client.available = True
+        self.client.model_ready = True
+        self.classifier.batch_size = OLLAMA_BATCH_SIZE
+        self.classifier._classified = 0
+        self.classifier._overridden = 0
+        self.classifier._errors = 0
+        self.classifier._batches = 0
 
-        ai_response = _make_ai_response([
-            {"path": path, "action": "DELETE_JUNK", "confidence": 0.99,
-             "reason": "Temp photo", "category": "media"},
-        ])
+    def set_responses(self, responses: list[str | Exception]) -> None:
+        self.client.responses = deque(responses)
+        self.client.calls = 0
 
-        client = self._mock_ollama([ai_response])
-        classifier = FileClassifier(db, ollama_client=client)
-        result = classifier.classify_batch_direct(files)
 
-        assert result[0]["action"] == "KEEP"
-        assert result[0]["overridden"] == 1
+@pytest.fixture(scope="module")
+def _shared_harness(shared_db: Database) -> _ClassifierHarness:
+    return _ClassifierHarness(shared_db)
 
-    def test_safety_overrides_source_code_delete(self, db: Database) -> None:
-        path = r"C:\Projects\app.py"
-        _insert_test_file(db, path, "app.py", ".py")
-        files = db.get_files()
 
-        ai_response = _make_ai_response([
-            {"path": path, "action": "DELETE_UNUSED", "confidence": 0.95,
-             "reason": "Unused script", "category": "code"},
-        ])
+@pytest.fixture
+def harness(_shared_harness: _ClassifierHarness) -> _ClassifierHarness:
+    """The module's classifier harness, reset before each test."""
+    _shared_harness.reset()
+    return _shared_harness
 
-        client = self._mock_ollama([ai_response])
-        classifier = FileClassifier(db, ollama_client=client)
-        result = classifier.classify_batch_direct(files)
 
-        assert result[0]["action"] == "KEEP"
-        assert result[0]["overridden"] == 1
+class TestFileClassifier:
 
-    def test_low_confidence_delete_overridden(self, db: Database) -> None:
-        """Delete with confidence < 0.85 → overridden to KEEP."""
-        path = r"C:\Users\test\something.tmp"
-        _insert_test_file(db, path, "something.tmp", ".tmp")
-        files = db.get_files()
+    def test_classify_batch_stores_results(self, harness: _ClassifierHarness) -> None:
+        path = r"C:\Users\test\installer.msi"
+        _insert_test_file(harness.db, path, "installer.msi", ".msi", 50000)
+        files = harness.db.get_files()
 
-        ai_response = _make_ai_response([
-            {"path": path, "action": "DELETE_JUNK", "confidence": 0.6,
-             "reason": "Maybe junk", "category": "temp"},
-        ])
+        harness.set_responses([_make_ai_response([
+            {"path": path, "action": "DELETE_JUNK", "confidence": 0.95,
+             "reason": "Old installer", "category": "junk"},
+        ])])
+        result = harness.classifier.classify_batch_direct(files)
 
-        client = self._mock_ollama([ai_response])
-        classifier = FileClassifier(db, ollama_client=client)
-        result = classifier.classify_batch_direct(files)
+        assert len(result) == 1
+        assert result[0]["action"] == "DELETE_JUNK"  # .msi is not guardian-protected
 
+    @pytest.mark.parametrize(
+        ("path", "name", "ext", "action", "confidence", "reason_part"),
+        [
+            # AI says delete a .docx → Document Guardian overrides to KEEP
+            (r"C:\Users\test\report.docx", "report.docx", ".docx", "DELETE_JUNK", 0.99, "Guardian"),
+            (r"C:\Users\test\photo.jpg", "photo.jpg", ".jpg", "DELETE_JUNK", 0.99, None),
+            (r"C:\Projects\app.py", "app.py", ".py", "DELETE_UNUSED", 0.95, None),
+            # Delete with confidence < 0.85 → overridden to KEEP
+            (r"C:\Users\test\something.tmp", "something.tmp", ".tmp", "DELETE_JUNK", 0.6, None),
+            # Even if AI says delete a Windows system file, safety blocks it
+            (r"C:\Windows\System32\notepad.exe", "notepad.exe", ".exe", "DELETE_JUNK", 1.0, None),
+            # Sensitive files (.env) must be protected from deletion
+            (r"C:\Projects\myapp\.env", ".env", ".env", "DELETE_JUNK", 0.95, None),
+        ],
+        ids=["document", "photo", "source_code", "low_confidence", "protected_path", "sensitive"],
+    )
+    def test_safety_overrides_delete(
+        self, harness: _ClassifierHarness, path: str, name: str, ext: str,
+        action: str, confidence: float, reason_part: str | None,
+    ) -> None:
+        _insert_test_file(harness.db, path, name, ext)
+        files = harness.db.get_files()
+
+        harness.set_responses([_make_ai_response([
+            {"path": path, "action": action, "confidence": confidence,
+             "reason": "AI suggestion", "category": "test"},
+        ])])
+        result = harness.classifier.classify_batch_direct(files)
+
+        assert len(result) == 1
         assert result[0]["action"] == "KEEP"
         assert result[0]["overridden"] == 1
+        if reason_part:
+            assert reason_part in result[0]["override_reason"]
 
-    def test_move_action_passes_through(self, db: Database) -> None:
+    def test_move_action_passes_through(self, harness: _ClassifierHarness) -> None:
         """MOVE_DATA with good confidence should pass through unchanged."""
         path = r"C:\Users\test\data.bin"
-        _insert_test_file(db, path, "data.bin", ".bin", 100000)
-        files = db.get_files()
+        _insert_test_file(harness.db, path, "data.bin", ".bin", 100000)
+        files = harness.db.get_files()
 
-        ai_response = _make_ai_response([
+        harness.set_responses([_make_ai_response([
             {"path": path, "action": "MOVE_DATA", "confidence": 0.85,
              "reason": "Large data file, good for D:", "category": "data"},
-        ])
-
-        client = self._mock_ollama([ai_response])
-        classifier = FileClassifier(db, ollama_client=client)
-        result = classifier.classify_batch_direct(files)
+        ])])
+        result = harness.classifier.classify_batch_direct(files)
 
         assert result[0]["action"] == "MOVE_DATA"
         assert result[0]["overridden"] == 0
 
-    def test_missing_ai_result_defaults_to_keep(self, db: Database) -> None:
+    def test_missing_ai_result_defaults_to_keep(self, harness: _ClassifierHarness) -> None:
         """If AI doesn't return a result for a file, default to KEEP."""
-        _insert_test_file(db, r"C:\a.txt", "a.txt", ".txt")
-        _insert_test_file(db, r"C:\b.txt", "b.txt", ".txt")
-        files = db.get_files()
+        _insert_test_file(harness.db, r"C:\a.txt", "a.txt", ".txt")
+        _insert_test_file(harness.db, r"C:\b.txt", "b.txt", ".txt")
+        files = harness.db.get_files()
 
         # AI only returns one result for two files
-        ai_response = _make_ai_response([
-            {"path": r"C:\a.txt", "action": "KEEP", "confidence": 0.9,
-             "reason": "ok", "category": "x"},
-        ])
-
-        client = self._mock_ollama([ai_response])
-        classifier = FileClassifier(db, ollama_client=client)
-        result = classifier.classify_batch_direct(files)
+        harness.set_responses([_canned_response(_KEEP_TEMPLATE, [r"C:\a.txt"])])
+        result = harness.classifier.classify_batch_direct(files)
 
         # Both should be classified — the missing one defaults to KEEP
         assert len(result) == 2
         actions = {r["action"] for r in result}
         assert "KEEP" in actions
 
-    def test_classify_all_processes_batches(self, db: Database) -> None:
+    def test_classify_all_processes_batches(self, harness: _ClassifierHarness) -> None:
         """classify_all should process multiple batches."""
         # Insert 5 files, use batch_size=2
-        for i in range(5):
-            _insert_test_file(
-                db, f"C:\\file{i}.dat", f"file{i}.dat", ".dat", 100 * (i + 1),
-            )
-
-        def _make_batch_response(paths):
-            return _make_ai_response([
-                {"path": p, "action": "MOVE_DATA", "confidence": 0.85,
-                 "reason": "data file", "category": "data"}
-                for p in paths
-            ])
+        _bulk_insert_test_files(harness.db, [
+            (f"C:\\file{i}.dat", f"file{i}.dat", ".dat", 100 * (i + 1)) for i in range(5)
+        ])
 
         # We need 3 batches: [2, 2, 1] files
-        responses = [
-            _make_batch_response([f"C:\\file{i}.dat" for i in range(2)]),
-            _make_batch_response([f"C:\\file{i}.dat" for i in range(2, 4)]),
-            _make_batch_response([f"C:\\file4.dat"]),
-        ]
-
-        client = self._mock_ollama(responses)
-        classifier = FileClassifier(db, ollama_client=client, batch_size=2)
-        summary = classifier.classify_all()
+        harness.set_responses(_MOVE_DATA_BATCHES)
+        harness.classifier.batch_size = 2
+        summary = harness.classifier.classify_all()
 
         assert summary["classified"] == 5
         assert summary["batches"] == 3
         assert summary["errors"] == 0
 
-    def test_preflight_check_reports_status(self, db: Database) -> None:
-        client = MagicMock(spec=OllamaClient)
-        client.is_available.return_value = True
-        client.has_model.return_value = True
-
-        classifier = FileClassifier(db, ollama_client=client)
-        status = classifier.preflight_check()
+    def test_preflight_check_reports_status(self, harness: _ClassifierHarness) -> None:
+        status = harness.classifier.preflight_check()
         assert status["ollama_up"] is True
         assert status["model_ready"] is True
 
-    def test_preflight_check_ollama_down(self, db: Database) -> None:
-        client = MagicMock(spec=OllamaClient)
-        client.is_available.return_value = False
+    def test_preflight_check_ollama_down(self, harness: _ClassifierHarness) -> None:
+        harness.client.available = False
 
-        classifier = FileClassifier(db, ollama_client=client)
-        status = classifier.preflight_check()
+        status = harness.classifier.preflight_check()
         assert status["ollama_up"] is False
         assert status["model_ready"] is False
 
-    def test_connection_error_counts_as_errors(self, db: Database) -> None:
+    def test_connection_error_counts_as_errors(self, harness: _ClassifierHarness) -> None:
         """If Ollama connection fails mid-batch, files are counted as errors."""
-        for i in range(3):
-            _insert_test_file(db, f"C:\\file{i}.dat", f"file{i}.dat", ".dat")
-
-        client = MagicMock(spec=OllamaClient)
-        client.is_available.return_value = True
-        client.has_model.return_value = True
-        client.generate.side_effect = ConnectionError("Ollama went away")
+        _bulk_insert_test_files(harness.db, [
+            (f"C:\\file{i}.dat", f"file{i}.dat", ".dat", 1024) for i in range(3)
+        ])
 
-        classifier = FileClassifier(db, ollama_client=client, batch_size=10)
-        summary = classifier.classify_all()
+        harness.set_responses([ConnectionError("Ollama went away")] * 9)
+        harness.classifier.batch_size = 10
+        summary = harness.classifier.classify_all()
 
         # 3 files x 3 consecutive failures before abort
         assert summary["errors"] == 9
         assert summary["classified"] == 0
-
-    def test_protected_path_always_kept(self, db: Database) -> None:
-        """Even if AI says delete a Windows system file, safety blocks it."""
-        path = r"C:\Windows\System32\notepad.exe"
-        _insert_test_file(db, path, "notepad.exe", ".exe")
-        files = db.get_files()
-
-        ai_response = _make_ai_response([
-            {"path": path, "action": "DELETE_JUNK", "confidence": 1.0,
-             "reason": "junk", "category": "system"},
-        ])
-
-        client = self._mock_ollama([ai_response])
-        classifier = FileClassifier(db, ollama_client=client)
-        result = classifier.classify_batch_direct(files)
-
-        assert result[0]["action"] == "KEEP"
-        assert result[0]["overridden"] == 1
-
-    def test_sensitive_file_protected(self, db: Database) -> None:
-        """Sensitive files (.env) must be protected from deletion."""
-        path = r"C:\Projects\myapp\.env"
-        _insert_test_file(db, path, ".env", ".env")
-        files = db.get_files()
-
-        ai_response = _make_ai_response([
-            {"path": path, "action": "DELETE_JUNK", "confidence": 0.95,
-             "reason": "config junk", "category": "config"},
-        ])
-
-        client = self._mock_ollama([ai_response])
-        classifier = FileClassifier(db, ollama_client=client)
-        result = classifier.classify_batch_direct(files)
-
-        assert result[0]["action"] == "KEEP"
-        assert result[0]["overridden"] == 1
+        assert harness.client.calls == 3
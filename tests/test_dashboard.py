@@ -7,6 +7,8 @@ No Streamlit import needed — we test the data layer directly.
 
 from __future__ import annotations
 
+import sqlite3
+
 import pytest
 
 from drivemindr.database import Database
@@ -17,11 +19,9 @@ from drivemindr.database import Database
 # ---------------------------------------------------------------------------
 
 @pytest.fixture
-def db(tmp_path) -> Database:
-    database = Database(tmp_path / "test.db")
-    database.connect()
-    yield database
-    database.close()
+def db(memory_db) -> Database:
+    # In-memory clone of the session schema template (see conftest.py)
+    return memory_db
 
 
 def _insert_file(db: Database, path: str, name: str, ext: str, size: int = 1024) -> int:
@@ -52,22 +52,71 @@ def _classify_file(db: Database, file_id: int, action: str, confidence: float =
         cur.execute(sql, (file_id, action, confidence))
 
 
+def _bulk_insert_files(
+    db: Database, files: dict[str, tuple[str, str, int, str]],
+) -> dict[str, int]:
+    """Insert files and their classifications in one transaction.
+
+    *files* maps path → (name, ext, size, action). Returns path→id mapping.
+    """
+    file_rows = [
+        (path, name, ext, size, "2024-01-01T00:00:00", "2024-06-01T00:00:00",
+         "2024-12-01T00:00:00", "TestUser", 0, 0, "C:\\Users\\test", "test001")
+        for path, (name, ext, size, _) in files.items()
+    ]
+    class_rows = [(action, path) for path, (_, _, _, action) in files.items()]
+    with db.transaction() as cur:
+        cur.executemany(
+            """INSERT INTO files (path, name, extension, size_bytes, created, modified,
+                                  accessed, owner, is_readonly, is_dir, parent_dir, scan_id)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            file_rows,
+        )
+        cur.executemany(
+            """INSERT INTO classifications (file_id, action, confidence, reason, category,
+                                            overridden, override_reason)
+               SELECT id, ?, 0.9, 'test reason', 'test', 0, NULL FROM files WHERE path = ?""",
+            class_rows,
+        )
+        cur.execute("SELECT path, id FROM files")
+        return {path: fid for path, fid in cur.fetchall() if path in files}
+
+
 def _setup_classified_files(db: Database) -> dict[str, int]:
     """Insert a set of files with classifications. Returns path→id mapping."""
-    files = {
+    return _bulk_insert_files(db, {
         r"C:\temp\junk.tmp": ("junk.tmp", ".tmp", 5000, "DELETE_JUNK"),
         r"C:\old\unused.exe": ("unused.exe", ".exe", 50000, "DELETE_UNUSED"),
         r"C:\Users\data.bin": ("data.bin", ".bin", 100000, "MOVE_DATA"),
         r"C:\Apps\steam.exe": ("steam.exe", ".exe", 200000, "MOVE_APP"),
         r"C:\docs\report.pdf": ("report.pdf", ".pdf", 3000, "KEEP"),
         r"C:\old\archive.zip": ("archive.zip", ".zip", 80000, "ARCHIVE"),
-    }
-    ids = {}
-    for path, (name, ext, size, action) in files.items():
-        fid = _insert_file(db, path, name, ext, size)
-        _classify_file(db, fid, action)
-        ids[path] = fid
-    return ids
+    })
+
+
+@pytest.fixture(scope="module")
+def _classified_snapshot(clone_template) -> tuple[bytes, dict[str, int]]:
+    """Serialized image of a database populated by _setup_classified_files."""
+    database = clone_template()
+    ids = _setup_classified_files(database)
+    blob = database.conn.serialize()
+    database.close()
+    return blob, ids
+
+
+@pytest.fixture
+def classified_db(_classified_snapshot) -> Database:
+    """A fresh copy of the classified-files database, restored from the snapshot."""
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.deserialize(_classified_snapshot[0])
+    # No close() on teardown: an in-memory connection is freed when collected
+    return Database.from_connection(conn)
+
+
+@pytest.fixture
+def classified_ids(_classified_snapshot) -> dict[str, int]:
+    """Path→id mapping for the rows in ``classified_db``."""
+    return _classified_snapshot[1]
 
 
 # ---------------------------------------------------------------------------
@@ -80,9 +129,8 @@ class TestClassificationSummary:
         summary = db.get_classification_summary()
         assert summary == {}
 
-    def test_summary_counts_and_bytes(self, db: Database) -> None:
-        _setup_classified_files(db)
-        summary = db.get_classification_summary()
+    def test_summary_counts_and_bytes(self, classified_db: Database) -> None:
+        summary = classified_db.get_classification_summary()
 
         assert "DELETE_JUNK" in summary
         assert summary["DELETE_JUNK"]["count"] == 1
@@ -92,40 +140,37 @@ class TestClassificationSummary:
         assert summary["MOVE_DATA"]["count"] == 1
         assert summary["MOVE_DATA"]["bytes"] == 100000
 
-    def test_summary_includes_all_actions(self, db: Database) -> None:
-        _setup_classified_files(db)
-        summary = db.get_classification_summary()
+    def test_summary_includes_all_actions(self, classified_db: Database) -> None:
+        summary = classified_db.get_classification_summary()
         assert len(summary) == 6  # 6 distinct actions
 
 
 class TestFilesbyAction:
 
-    def test_returns_files_for_action(self, db: Database) -> None:
-        _setup_classified_files(db)
-        files = db.get_files_by_action("DELETE_JUNK")
+    def test_returns_files_for_action(self, classified_db: Database) -> None:
+        files = classified_db.get_files_by_action("DELETE_JUNK")
         assert len(files) == 1
         assert files[0]["name"] == "junk.tmp"
 
-    def test_includes_classification_data(self, db: Database) -> None:
-        _setup_classified_files(db)
-        files = db.get_files_by_action("MOVE_DATA")
+    def test_includes_classification_data(self, classified_db: Database) -> None:
+        files = classified_db.get_files_by_action("MOVE_DATA")
         assert len(files) == 1
         f = files[0]
         assert f["ai_action"] == "MOVE_DATA"
         assert f["confidence"] == 0.9
         assert f["reason"] == "test reason"
 
-    def test_empty_action_returns_empty(self, db: Database) -> None:
-        _setup_classified_files(db)
-        files = db.get_files_by_action("NONEXISTENT")
+    def test_empty_action_returns_empty(self, classified_db: Database) -> None:
+        files = classified_db.get_files_by_action("NONEXISTENT")
         assert files == []
 
-    def test_includes_user_decision_if_exists(self, db: Database) -> None:
-        ids = _setup_classified_files(db)
-        junk_id = ids[r"C:\temp\junk.tmp"]
-        db.save_user_decision(junk_id, "APPROVE")
+    def test_includes_user_decision_if_exists(
+        self, classified_db: Database, classified_ids: dict[str, int],
+    ) -> None:
+        junk_id = classified_ids[r"C:\temp\junk.tmp"]
+        classified_db.save_user_decision(junk_id, "APPROVE")
 
-        files = db.get_files_by_action("DELETE_JUNK")
+        files = classified_db.get_files_by_action("DELETE_JUNK")
         assert files[0]["decision"] == "APPROVE"
 
 
@@ -162,14 +207,15 @@ class TestUserDecisions:
         files = db.get_files_by_action("DELETE_JUNK")
         assert files[0]["decision"] == "REJECT"
 
-    def test_batch_decisions(self, db: Database) -> None:
-        ids = _setup_classified_files(db)
-        all_ids = list(ids.values())
+    def test_batch_decisions(
+        self, classified_db: Database, classified_ids: dict[str, int],
+    ) -> None:
+        all_ids = list(classified_ids.values())
 
-        count = db.save_batch_decisions(all_ids, "APPROVE")
+        count = classified_db.save_batch_decisions(all_ids, "APPROVE")
         assert count == len(all_ids)
 
-        stats = db.get_review_stats()
+        stats = classified_db.get_review_stats()
         assert stats["approved"] == len(all_ids)
 
 
@@ -185,22 +231,24 @@ class TestReviewStats:
         assert stats["reviewed"] == 0
         assert stats["pending"] == 0
 
-    def test_with_classified_files(self, db: Database) -> None:
-        _setup_classified_files(db)
-        stats = db.get_review_stats()
+    def test_with_classified_files(self, classified_db: Database) -> None:
+        stats = classified_db.get_review_stats()
         assert stats["classified"] == 6
         assert stats["pending"] == 6
         assert stats["reviewed"] == 0
 
-    def test_after_reviews(self, db: Database) -> None:
-        ids = _setup_classified_files(db)
-        junk_id = ids[r"C:\temp\junk.tmp"]
-        data_id = ids[r"C:\Users\data.bin"]
+    def test_after_reviews(
+        self, classified_db: Database, classified_ids: dict[str, int],
+    ) -> None:
+        junk_id = classified_ids[r"C:\temp\junk.tmp"]
+        data_id = classified_ids[r"C:\Users\data.bin"]
 
-        db.save_user_decision(junk_id, "APPROVE")
-        db.save_user_decision(data_id, "REJECT")
+        classified_db.save_user_decisions([
+            (junk_id, "APPROVE", None),
+            (data_id, "REJECT", None),
+        ])
 
-        stats = db.get_review_stats()
+        stats = classified_db.get_review_stats()
         assert stats["classified"] == 6
         assert stats["reviewed"] == 2
         assert stats["approved"] == 1
@@ -214,35 +262,49 @@ class TestReviewStats:
 
 class TestApprovedActions:
 
-    def test_empty_when_no_approvals(self, db: Database) -> None:
-        _setup_classified_files(db)
-        approved = db.get_approved_actions()
+    def test_empty_when_no_approvals(self, classified_db: Database) -> None:
+        approved = classified_db.get_approved_actions()
         assert approved == []
 
-    def test_returns_only_approved(self, db: Database) -> None:
-        ids = _setup_classified_files(db)
-        junk_id = ids[r"C:\temp\junk.tmp"]
-        data_id = ids[r"C:\Users\data.bin"]
-        keep_id = ids[r"C:\docs\report.pdf"]
+    def test_returns_only_approved(
+        self, classified_db: Database, classified_ids: dict[str, int],
+    ) -> None:
+        junk_id = classified_ids[r"C:\temp\junk.tmp"]
+        data_id = classified_ids[r"C:\Users\data.bin"]
+        keep_id = classified_ids[r"C:\docs\report.pdf"]
 
-        db.save_user_decision(junk_id, "APPROVE")
-        db.save_user_decision(data_id, "APPROVE")
-        db.save_user_decision(keep_id, "REJECT")
+        classified_db.save_user_decisions([
+            (junk_id, "APPROVE", None),
+            (data_id, "APPROVE", None),
+            (keep_id, "REJECT", None),
+        ])
 
-        approved = db.get_approved_actions()
+        approved = classified_db.get_approved_actions()
         assert len(approved) == 2
         paths = {a["path"] for a in approved}
         assert r"C:\temp\junk.tmp" in paths
         assert r"C:\Users\data.bin" in paths
 
-    def test_uses_changed_action_when_present(self, db: Database) -> None:
-        ids = _setup_classified_files(db)
-        junk_id = ids[r"C:\temp\junk.tmp"]
+    def test_execution_plan_matches_approved(
+        self, classified_db: Database, classified_ids: dict[str, int],
+    ) -> None:
+        classified_db.save_batch_decisions(list(classified_ids.values()), "APPROVE")
+
+        plan = classified_db.get_execution_plan()
+        approved = classified_db.get_approved_actions()
+        assert [r["id"] for r in plan] == [r["id"] for r in approved]
+        assert set(plan[0].keys()) == {"id", "path", "extension", "final_action"}
+        assert plan[0]["final_action"] == "DELETE_JUNK"
+
+    def test_uses_changed_action_when_present(
+        self, classified_db: Database, classified_ids: dict[str, int],
+    ) -> None:
+        junk_id = classified_ids[r"C:\temp\junk.tmp"]
 
         # User changes DELETE_JUNK to ARCHIVE and approves
-        db.save_user_decision(junk_id, "APPROVE", "ARCHIVE")
+        classified_db.save_user_decision(junk_id, "APPROVE", "ARCHIVE")
 
-        approved = db.get_approved_actions()
+        approved = classified_db.get_approved_actions()
         assert len(approved) == 1
         assert approved[0]["final_action"] == "ARCHIVE"
 
@@ -257,9 +319,8 @@ class TestSpaceRecovery:
         recovery = db.get_space_recovery_estimate()
         assert recovery == {}
 
-    def test_sums_delete_and_archive(self, db: Database) -> None:
-        _setup_classified_files(db)
-        recovery = db.get_space_recovery_estimate()
+    def test_sums_delete_and_archive(self, classified_db: Database) -> None:
+        recovery = classified_db.get_space_recovery_estimate()
 
         assert recovery["DELETE_JUNK"] == 5000
         assert recovery["DELETE_UNUSED"] == 50000
@@ -297,22 +358,23 @@ class TestExtensionBreakdown:
 
 class TestUnreviewedFiles:
 
-    def test_returns_all_classified_when_none_reviewed(self, db: Database) -> None:
-        _setup_classified_files(db)
-        unreviewed = db.get_unreviewed_files()
+    def test_returns_all_classified_when_none_reviewed(self, classified_db: Database) -> None:
+        unreviewed = classified_db.get_unreviewed_files()
         assert len(unreviewed) == 6
 
-    def test_excludes_reviewed(self, db: Database) -> None:
-        ids = _setup_classified_files(db)
-        db.save_user_decision(ids[r"C:\temp\junk.tmp"], "APPROVE")
-        db.save_user_decision(ids[r"C:\Users\data.bin"], "REJECT")
+    def test_excludes_reviewed(
+        self, classified_db: Database, classified_ids: dict[str, int],
+    ) -> None:
+        classified_db.save_user_decisions([
+            (classified_ids[r"C:\temp\junk.tmp"], "APPROVE", None),
+            (classified_ids[r"C:\Users\data.bin"], "REJECT", None),
+        ])
 
-        unreviewed = db.get_unreviewed_files()
+        unreviewed = classified_db.get_unreviewed_files()
         assert len(unreviewed) == 4
 
-    def test_orders_deletes_first(self, db: Database) -> None:
-        _setup_classified_files(db)
-        unreviewed = db.get_unreviewed_files()
+    def test_orders_deletes_first(self, classified_db: Database) -> None:
+        unreviewed = classified_db.get_unreviewed_files()
         # DELETE_JUNK and DELETE_UNUSED should come before MOVE/KEEP
         actions = [f["ai_action"] for f in unreviewed]
         delete_indices = [i for i, a in enumerate(actions) if a.startswith("DELETE")]
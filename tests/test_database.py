@@ -1,17 +1,16 @@
 """Tests for the SQLite database module."""
 
+import sqlite3
+
 import pytest
 
+from drivemindr.config import DB_MMAP_SIZE
 from drivemindr.database import Database
 
 
 @pytest.fixture
-def db(tmp_path) -> Database:
-    """Provide a clean in-memory-like database for each test."""
-    database = Database(tmp_path / "test.db")
-    database.connect()
-    yield database
-    database.close()
+def db(file_db: Database) -> Database:
+    return file_db
 
 
 def _sample_file(path: str = r"C:\Users\test\file.txt", **overrides) -> dict:
@@ -48,6 +47,42 @@ class TestDatabaseConnect:
         assert "installed_apps" in table_names
         assert "dir_sizes" in table_names
 
+    def test_connection_pragmas(self, db: Database) -> None:
+        conn = db.conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        assert conn.execute("PRAGMA mmap_size").fetchone()[0] == DB_MMAP_SIZE
+
+    def test_memory_database_skips_wal(self) -> None:
+        database = Database(":memory:")
+        database.connect()
+        assert database.is_memory
+        assert database.conn.execute("PRAGMA journal_mode").fetchone()[0] == "memory"
+        database.close()
+
+    def test_immediate_transaction_begins_up_front(self, db: Database) -> None:
+        with db.transaction():
+            assert db.conn.in_transaction  # before any statement ran
+            other = sqlite3.connect(str(db.db_path), timeout=0, isolation_level=None)
+            try:
+                with pytest.raises(sqlite3.OperationalError, match="locked"):
+                    other.execute("BEGIN IMMEDIATE")
+            finally:
+                other.close()
+        assert not db.conn.in_transaction
+
+    def test_from_connection_clones_schema(self, memory_db: Database) -> None:
+        tables = {
+            r[0] for r in memory_db.conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table'"
+            ).fetchall()
+        }
+        assert "files" in tables
+        assert memory_db.conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        assert memory_db.file_count() == 0
+
 
 class TestFileOperations:
 
@@ -75,6 +110,18 @@ class TestFileOperations:
         assert count == 100
         assert db.file_count() == 100
 
+    def test_bulk_upsert_refreshes_statistics(self, db: Database, monkeypatch) -> None:
+        monkeypatch.setattr("drivemindr.database._ANALYZE_AFTER_ROWS", 10)
+        db.bulk_upsert_files([
+            _sample_file(path=f"C:\\file{i}.txt", name=f"file{i}.txt")
+            for i in range(10)
+        ])
+        stat = db.conn.execute(
+            "SELECT stat FROM sqlite_stat1 WHERE tbl = 'files' LIMIT 1"
+        ).fetchone()
+        assert stat is not None
+        assert stat[0].split()[0] == "10"
+
     def test_top_largest(self, db: Database) -> None:
         for i in range(5):
             db.upsert_file(_sample_file(
@@ -115,6 +162,20 @@ class TestDirSizes:
         assert rows[0]["total_bytes"] == 50000
         assert rows[0]["file_count"] == 25
 
+    def test_aggregate_from_files(self, db: Database) -> None:
+        db.bulk_upsert_files([
+            _sample_file(r"C:\Users\test\a.txt", size_bytes=100),
+            _sample_file(r"C:\Users\test\b.txt", size_bytes=250),
+            _sample_file(r"C:\Other\c.txt", size_bytes=7, parent_dir=r"C:\Other"),
+            _sample_file(r"C:\Users\test\sub", size_bytes=0, is_dir=1),
+            _sample_file(r"C:\Users\test\old.txt", scan_id="older"),
+        ])
+        assert db.aggregate_dir_sizes("test001") == 2
+        rows = {r["path"]: r for r in db.get_dir_sizes()}
+        assert rows[r"C:\Users\test"]["total_bytes"] == 350
+        assert rows[r"C:\Users\test"]["file_count"] == 2
+        assert rows[r"C:\Other"]["total_bytes"] == 7
+
 
 class TestInstalledApps:
 
@@ -146,3 +207,14 @@ class TestTransaction:
             pass
         # File should still exist due to rollback
         assert db.file_count() == 1
+
+    def test_nested_transaction_uses_savepoint(self, db: Database) -> None:
+        """An inner failure undoes only the inner block; the outer one commits."""
+        with db.transaction():
+            db.upsert_file(_sample_file())
+            with pytest.raises(ValueError):
+                with db.transaction() as cur:
+                    cur.execute("DELETE FROM files")
+                    raise ValueError("simulated error")
+            assert db.conn.in_transaction  # the inner block did not commit
+        assert db.file_count() == 1
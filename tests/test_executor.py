@@ -8,15 +8,37 @@ symlinks, and the full executor pipeline.
 
 from __future__ import annotations
 
+import errno
+import hashlib
+import os
 import zipfile
 from pathlib import Path
 
 import pytest
 
+from drivemindr.config import D_DRIVE_STRUCTURE
 from drivemindr.database import Database
-from drivemindr.executor import ExecutionEngine, _categorize_destination, _compute_dest_path
-from drivemindr.symlinks import AppMigrator, create_junction, is_junction, remove_junction
-from drivemindr.undo import UndoManager, file_checksum, generate_batch_id
+from drivemindr.executor import (
+    ExecutionEngine,
+    _categorize_destination,
+    _compute_dest_path,
+    _zip_write,
+)
+from drivemindr.symlinks import (
+    AppMigrator,
+    _count_files,
+    create_junction,
+    is_junction,
+    remove_junction,
+)
+from drivemindr.undo import (
+    UndoManager,
+    fast_move,
+    file_checksum,
+    generate_batch_id,
+    tagged_checksum,
+    verify_checksum,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -24,11 +46,8 @@ from drivemindr.undo import UndoManager, file_checksum, generate_batch_id
 # ---------------------------------------------------------------------------
 
 @pytest.fixture
-def db(tmp_path) -> Database:
-    database = Database(tmp_path / "test.db")
-    database.connect()
-    yield database
-    database.close()
+def db(file_db: Database) -> Database:
+    return file_db
 
 
 @pytest.fixture
@@ -98,6 +117,35 @@ class TestChecksum:
     def test_nonexistent_returns_none(self, tmp_path) -> None:
         assert file_checksum(tmp_path / "nope.txt") is None
 
+    def test_large_file_checksum_matches_hashlib(self, tmp_path) -> None:
+        f = tmp_path / "big.bin"
+        data = os.urandom(300_000)  # above the mmap threshold
+        f.write_bytes(data)
+        assert file_checksum(f) == hashlib.sha256(data).hexdigest()
+
+    def test_blake3_matches_reference(self, tmp_path) -> None:
+        blake3 = pytest.importorskip("blake3")
+        f = tmp_path / "big.bin"
+        data = os.urandom(300_000)
+        f.write_bytes(data)
+        assert file_checksum(f, "blake3") == blake3.blake3(data).hexdigest()
+
+    def test_tagged_checksum_has_algorithm_prefix(self, tmp_path) -> None:
+        f = tmp_path / "test.txt"
+        f.write_text("hello world")
+        tag, _, digest = tagged_checksum(f, "sha256").partition(":")
+        assert tag == "sha256"
+        assert digest == file_checksum(f)
+
+    def test_verify_tagged_and_legacy(self, tmp_path) -> None:
+        f = tmp_path / "test.txt"
+        f.write_text("hello world")
+        stored = tagged_checksum(f)
+        assert verify_checksum(f, stored) is True
+        assert verify_checksum(f, file_checksum(f)) is True  # untagged = sha256
+        f.write_text("changed")
+        assert verify_checksum(f, stored) is False
+
 
 # ---------------------------------------------------------------------------
 # Batch ID
@@ -136,10 +184,70 @@ class TestUndoManager:
 
         actions = undo.get_batch_actions(bid)
         assert len(actions) == 2
+        assert "checksum_before" not in actions[0]
         # Should be in reverse order (for undo)
         assert actions[0]["action"] == "DELETED"
         assert actions[1]["action"] == "MOVED"
 
+    def test_log_actions_bulk(self, undo: UndoManager) -> None:
+        bid = "batch_bulk"
+        ids = undo.log_actions_bulk([
+            (None, "MOVED", "/src/a.txt", "/dst/a.txt", None, None, bid),
+            (None, "DELETED", "/src/b.txt", "/trash/b.txt", None, None, bid),
+            (None, "ARCHIVED", "/src/c.txt", "/arc/c.zip", None, None, bid),
+        ])
+        assert len(ids) == 3
+        actions = undo.get_batch_actions(bid)
+        assert [a["id"] for a in actions] == sorted(ids, reverse=True)
+        assert actions[0]["action"] == "ARCHIVED"
+
+    def test_checksum_many(self, undo: UndoManager, tmp_path) -> None:
+        paths = []
+        for i in range(5):
+            f = tmp_path / f"f{i}.txt"
+            f.write_text(f"content {i}")
+            paths.append(f)
+        paths.append(tmp_path / "missing.txt")
+
+        result = undo.checksum_many(paths, max_workers=3)
+        assert set(result) == set(paths)
+        assert result[paths[0]] == tagged_checksum(paths[0])
+        assert result[tmp_path / "missing.txt"] is None
+
+    def test_batch_actions_with_files(self, db: Database, undo: UndoManager) -> None:
+        fid = _insert_file(db, r"C:\data\a.bin", "a.bin", ".bin", size=4096)
+        bid = "batch_join"
+        undo.log_action(fid, "MOVED", r"C:\data\a.bin", r"D:\a.bin", bid)
+        undo.log_action(None, "ARCHIVED", "/src/x", "/arc/x.zip", bid)
+
+        actions = undo.get_batch_actions_with_files(bid)
+        assert actions[0]["file_size"] is None
+        assert actions[1]["file_size"] == 4096
+        assert actions[1]["file_path"] == r"C:\data\a.bin"
+
+    def test_delete_many_to_trash(self, undo: UndoManager, tmp_path) -> None:
+        srcs = []
+        for i in range(3):
+            src = tmp_path / f"dir{i}" / "same.txt"
+            src.parent.mkdir()
+            src.write_text(f"content {i}")
+            srcs.append(src)
+        missing = tmp_path / "gone.txt"
+        bid = undo.new_batch()
+
+        moved = undo.delete_many_to_trash(
+            [(None, p) for p in srcs] + [(None, missing)], bid,
+        )
+
+        assert len(moved) == 3
+        assert not any(p.exists() for p in srcs)
+        assert len({dst.name for _, _, dst in moved}) == 3
+        actions = undo.get_batch_actions(bid, include_checksums=True)
+        assert len(actions) == 3
+        assert all(a["action"] == "DELETED" and a["checksum_before"] for a in actions)
+        assert undo.undo_batch(bid)["undone"] == 3
+        assert all(p.exists() for p in srcs)
+
     def test_undo_move(self, undo: UndoManager, tmp_path) -> None:
         src = tmp_path / "original" / "file.txt"
         dst = tmp_path / "moved" / "file.txt"
@@ -155,6 +263,70 @@ class TestUndoManager:
         assert src.exists()
         assert not dst.exists()
 
+    def test_fast_move_cross_volume_fallback(self, tmp_path, monkeypatch) -> None:
+        src = tmp_path / "a.txt"
+        dst = tmp_path / "b.txt"
+        src.write_text("payload")
+
+        def _exdev(a, b):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+        monkeypatch.setattr(os, "replace", _exdev)
+        assert fast_move(src, dst) is False
+        assert not src.exists()
+        assert dst.read_text() == "payload"
+
+    def test_undo_move_warns_on_changed_file(self, undo: UndoManager, tmp_path, caplog) -> None:
+        src = tmp_path / "original" / "file.txt"
+        dst = tmp_path / "moved" / "file.txt"
+        dst.parent.mkdir(parents=True)
+        dst.write_text("content")
+        checksum = tagged_checksum(dst)
+        dst.write_text("edited after the move")
+
+        bid = "batch_tampered"
+        undo.log_action(None, "MOVED", str(src), str(dst), bid, checksum, checksum)
+
+        result = undo.undo_batch(bid)
+        assert result["undone"] == 1
+        assert src.read_text() == "edited after the move"
+        assert "checksum mismatch" in caplog.text
+
+    def test_undo_move_never_overwrites_recreated_source(
+        self, undo: UndoManager, tmp_path,
+    ) -> None:
+        src = tmp_path / "original" / "file.txt"
+        dst = tmp_path / "moved" / "file.txt"
+        src.parent.mkdir(parents=True)
+        dst.parent.mkdir(parents=True)
+        dst.write_text("moved copy")
+        src.write_text("newer file")  # user re-created the original path
+
+        bid = "batch_recreated"
+        undo.log_action(None, "MOVED", str(src), str(dst), bid)
+
+        result = undo.undo_batch(bid)
+        assert result["failed"] == 1
+        assert src.read_text() == "newer file"
+        assert dst.read_text() == "moved copy"
+
+    def test_undo_delete_never_overwrites_recreated_source(
+        self, undo: UndoManager, tmp_path,
+    ) -> None:
+        src = tmp_path / "original" / "deleted.txt"
+        trash = tmp_path / "trash" / "deleted.txt"
+        src.parent.mkdir(parents=True)
+        trash.parent.mkdir(parents=True)
+        trash.write_text("trashed copy")
+        src.write_text("newer file")
+
+        bid = "batch_recreated_delete"
+        undo.log_action(None, "DELETED", str(src), str(trash), bid)
+
+        assert undo.undo_batch(bid)["failed"] == 1
+        assert src.read_text() == "newer file"
+        assert trash.exists()
+
     def test_undo_delete(self, undo: UndoManager, tmp_path) -> None:
         src = tmp_path / "original" / "deleted.txt"
         trash = tmp_path / "trash" / "deleted.txt"
@@ -181,6 +353,17 @@ class TestUndoManager:
         assert result["undone"] == 1
         assert not archive.exists()
 
+    def test_undo_marks_entries_undone(self, undo: UndoManager, tmp_path) -> None:
+        bid = "batch_mark"
+        for i in range(3):
+            archive = tmp_path / f"a{i}.zip"
+            archive.write_bytes(b"zip")
+            undo.log_action(None, "ARCHIVED", f"/src/{i}.txt", str(archive), bid)
+
+        assert undo.undo_batch(bid)["undone"] == 3
+        assert undo.get_batch_actions(bid) == []
+        assert undo.get_recent_batches()[0]["undone_count"] == 3
+
     def test_undo_dry_run_changes_nothing(self, undo: UndoManager, tmp_path) -> None:
         dst = tmp_path / "moved" / "file.txt"
         dst.parent.mkdir(parents=True)
@@ -214,6 +397,16 @@ class TestUndoManager:
         assert "batch_123" in str(path)
         assert "file.tmp" in str(path)
 
+    def test_trash_path_resolves_collisions(self, undo: UndoManager) -> None:
+        existing = undo.trash_dir / "batch_c" / "readme.txt"
+        existing.parent.mkdir(parents=True)
+        existing.write_text("already trashed")
+
+        first = undo.get_trash_path(Path("/a/readme.txt"), "batch_c")
+        second = undo.get_trash_path(Path("/b/readme.txt"), "batch_c")
+        assert first.name == "readme_1.txt"
+        assert second.name == "readme_2.txt"
+
 
 # ---------------------------------------------------------------------------
 # Destination categorization
@@ -260,6 +453,13 @@ class TestComputeDestPath:
 
 class TestSymlinks:
 
+    def test_count_files_walks_tree(self, tmp_path) -> None:
+        (tmp_path / "a" / "b").mkdir(parents=True)
+        (tmp_path / "top.txt").write_text("1")
+        (tmp_path / "a" / "mid.txt").write_text("2")
+        (tmp_path / "a" / "b" / "deep.txt").write_text("3")
+        assert _count_files(tmp_path) == 3
+
     def test_create_and_detect_junction(self, tmp_path) -> None:
         target = tmp_path / "app_data"
         target.mkdir()
@@ -354,6 +554,90 @@ class TestExecutionEngine:
         )
         return engine, trash, app_target
 
+    def test_checksums_flush_at_threshold(self, db: Database, tmp_path, monkeypatch) -> None:
+        monkeypatch.setattr("drivemindr.executor._CHECKSUM_FLUSH_ROWS", 2)
+        engine, _, _ = self._setup_engine(db, tmp_path)
+        for i in range(3):
+            log_id = engine._log_intent(None, "MOVED", f"/src/{i}", f"/dst/{i}", "batch_flush")
+            engine._record_checksum(log_id, f"sha256:{i}")
+
+        def _recorded() -> int:
+            actions = engine.undo.get_batch_actions("batch_flush", include_checksums=True)
+            return sum(a["checksum_after"] is not None for a in actions)
+
+        assert _recorded() == 2
+        engine._flush_checksums()
+        assert _recorded() == 3
+
+    def test_interrupted_batch_leaves_every_move_logged(
+        self, db: Database, tmp_path, monkeypatch,
+    ) -> None:
+        """A kill mid-batch must not leave a moved file without an undo row."""
+        monkeypatch.setitem(D_DRIVE_STRUCTURE, "documents", str(tmp_path / "D" / "Documents"))
+        srcs = []
+        for i in range(5):
+            src = tmp_path / "Users" / "test" / "Docs" / f"note{i}.txt"
+            src.parent.mkdir(parents=True, exist_ok=True)
+            src.write_text(f"note {i}")
+            srcs.append(src)
+            fid = _insert_file(db, str(src), src.name, ".txt", 10)
+            _classify(db, fid, "MOVE_DATA")
+            _approve(db, fid)
+
+        class _Killed(BaseException):
+            pass
+
+        calls = 0
+
+        def _dying_move(src, dst):
+            nonlocal calls
+            calls += 1
+            if calls == 4:
+                raise _Killed
+            return fast_move(src, dst)
+
+        monkeypatch.setattr("drivemindr.executor.fast_move", _dying_move)
+        engine, _, _ = self._setup_engine(db, tmp_path)
+        # Nothing may be written after the kill, as after a power loss
+        monkeypatch.setattr(engine, "_flush_checksums", lambda: None)
+        with pytest.raises(_Killed):
+            engine.execute_plan()
+
+        moved = [str(p) for p in srcs if not p.exists()]
+        assert len(moved) == 3
+        rows = db.conn.execute(
+            "SELECT source_path, batch_id FROM action_log WHERE action = 'MOVED'"
+        ).fetchall()
+        assert set(moved) <= {r["source_path"] for r in rows}
+
+        # The row written for the interrupted move is skipped; the rest restore
+        assert engine.undo.undo_batch(rows[0]["batch_id"])["undone"] == 3
+        assert all(p.exists() for p in srcs)
+
+    def test_prefetch_uses_configured_workers(
+        self, db: Database, tmp_path, monkeypatch,
+    ) -> None:
+        src = tmp_path / "source" / "junk.tmp"
+        src.parent.mkdir(parents=True)
+        src.write_text("junk")
+        fid = _insert_file(db, str(src), "junk.tmp", ".tmp", 100)
+        _classify(db, fid, "DELETE_JUNK")
+        _approve(db, fid)
+
+        engine, _, _ = self._setup_engine(db, tmp_path)
+        engine.checksum_workers = 1
+        seen: list[int | None] = []
+        original = engine.undo.checksum_many
+
+        def _spy(paths, *, algorithm, max_workers):
+            seen.append(max_workers)
+            return original(paths, algorithm=algorithm, max_workers=max_workers)
+
+        monkeypatch.setattr(engine.undo, "checksum_many", _spy)
+        summary = engine.execute_plan()
+        assert summary["deleted"] == 1
+        assert seen == [1]
+
     def test_dry_run_makes_no_changes(self, db: Database, tmp_path) -> None:
         # Create a real file
         src = tmp_path / "source" / "junk.tmp"
@@ -419,6 +703,32 @@ class TestExecutionEngine:
         # Original still exists (archive is additive)
         assert src.exists()
 
+    def test_archive_stores_precompressed_files(self, tmp_path) -> None:
+        src = tmp_path / "source" / "album"
+        src.mkdir(parents=True)
+        (src / "notes.txt").write_text("cold data " * 100)
+        (src / "photo.jpg").write_bytes(os.urandom(2048))
+
+        archive = tmp_path / "album.zip"
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+            for fp in sorted(src.iterdir()):
+                _zip_write(zf, fp, fp.name)
+
+        with zipfile.ZipFile(archive) as zf:
+            types = {i.filename: i.compress_type for i in zf.infolist()}
+        assert types == {"notes.txt": zipfile.ZIP_DEFLATED, "photo.jpg": zipfile.ZIP_STORED}
+
+    def test_archive_name_collisions(self, db: Database, tmp_path) -> None:
+        archive_dir = tmp_path / "archive"
+        archive_dir.mkdir()
+        (archive_dir / "report.zip").write_bytes(b"zip")
+
+        engine, _, _ = self._setup_engine(db, tmp_path)
+        first = engine._free_archive_path(archive_dir, "report")
+        second = engine._free_archive_path(archive_dir, "report")
+        assert first.name == "report_1.zip"
+        assert second.name == "report_2.zip"
+
     def test_undo_after_delete(self, db: Database, tmp_path) -> None:
         """Delete then undo should restore the file."""
         src = tmp_path / "source" / "important.txt"
@@ -484,7 +794,7 @@ class TestExecutionEngine:
         src.parent.mkdir(parents=True)
         src.write_text("a,b,c\n1,2,3")
 
-        original_checksum = file_checksum(src)
+        original_checksum = tagged_checksum(src)
 
         fid = _insert_file(db, str(src), "data.csv", ".csv", 100)
         _classify(db, fid, "MOVE_DATA")
@@ -496,7 +806,7 @@ class TestExecutionEngine:
         assert summary["errors"] == 0
 
         # Check the logged checksum matches
-        actions = engine.undo.get_batch_actions(summary["batch_id"])
+        actions = engine.undo.get_batch_actions(summary["batch_id"], include_checksums=True)
         assert len(actions) == 1
         assert actions[0]["checksum_before"] == original_checksum
         assert actions[0]["checksum_after"] == original_checksum  # same content
@@ -11,6 +11,7 @@ from unittest.mock import MagicMock, patch
 
 from drivemindr.network import (
     LOOPBACK_ADDRS,
+    _is_loopback,
     check_outbound_connections,
     get_network_interfaces,
     verify_dns_not_leaking,
@@ -85,6 +86,30 @@ class TestCheckOutboundConnections:
         result = check_outbound_connections()
         assert result.safe is True
 
+    @patch("drivemindr.network.psutil.Process")
+    @patch("drivemindr.network.psutil.net_connections")
+    def test_process_name_looked_up_once_per_pid(self, mock_net, mock_proc) -> None:
+        conns = []
+        for port in (443, 444, 445):
+            conn = MagicMock()
+            conn.status = "ESTABLISHED"
+            conn.raddr = MagicMock()
+            conn.raddr.ip = "142.250.80.46"
+            conn.raddr.port = port
+            conn.laddr = MagicMock()
+            conn.laddr.port = 54321
+            conn.pid = 5555
+            conns.append(conn)
+        mock_net.return_value = conns
+
+        proc = MagicMock()
+        proc.name.return_value = "chrome"
+        mock_proc.return_value = proc
+
+        result = check_outbound_connections()
+        assert result.safe is True
+        mock_proc.assert_called_once_with(5555)
+
     @patch("drivemindr.network.psutil.net_connections")
     def test_non_established_connections_ignored(self, mock_net) -> None:
         conn = MagicMock()
@@ -165,3 +190,9 @@ class TestLoopbackAddrs:
         assert "127.0.0.1" in LOOPBACK_ADDRS
         assert "::1" in LOOPBACK_ADDRS
         assert "0.0.0.0" in LOOPBACK_ADDRS
+
+    def test_whole_loopback_range(self) -> None:
+        assert _is_loopback("127.0.1.1") is True
+        assert _is_loopback("::1") is True
+        assert _is_loopback("128.0.0.1") is False
+        assert _is_loopback("not-an-ip") is False
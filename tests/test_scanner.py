@@ -1,26 +1,42 @@
 """Tests for the file scanner module."""
 
 import os
+import time
 
 import pytest
 
+from drivemindr.config import DOCUMENT_EXTENSIONS
 from drivemindr.database import Database
-from drivemindr.scanner import FileScanner, _is_under_protected_path, _timestamp
+from drivemindr.scanner import FileScanner, _is_under_protected_path, _suffix, _timestamp
 
 
-@pytest.fixture
-def db(tmp_path) -> Database:
-    database = Database(tmp_path / "test.db")
-    database.connect()
+@pytest.fixture(scope="module")
+def shared_db(clone_template) -> Database:
+    """One in-memory database shared by the module's scanner tests."""
+    database = clone_template()
     yield database
     database.close()
 
 
 @pytest.fixture
-def scan_tree(tmp_path):
-    """Create a dedicated subdirectory tree for scanning (avoids pytest artifacts)."""
-    root = tmp_path / "scan_root"
-    root.mkdir()
+def db(shared_db: Database) -> Database:
+    """The shared database inside a transaction rolled back after each test.
+
+    Scanner writes nest under it as savepoints, so nothing a test stores
+    outlives it.
+    """
+    shared_db.conn.execute("BEGIN")
+    yield shared_db
+    shared_db.conn.execute("ROLLBACK")
+
+
+@pytest.fixture(scope="module")
+def scan_tree(tmp_path_factory):
+    """Create a dedicated subdirectory tree for scanning (avoids pytest artifacts).
+
+    Built once per module: the scanner only reads it.
+    """
+    root = tmp_path_factory.mktemp("scan_root")
 
     (root / "file1.txt").write_text("hello world")
     (root / "file2.py").write_text("print('hi')")
@@ -47,6 +63,12 @@ class TestTimestamp:
     def test_none_returns_none(self) -> None:
         assert _timestamp(None) is None
 
+    def test_repeated_epoch_served_from_cache(self) -> None:
+        _timestamp(1_700_000_000.25)
+        hits = _timestamp.cache_info().hits
+        _timestamp(1_700_000_000.25)
+        assert _timestamp.cache_info().hits == hits + 1
+
 
 class TestProtectedPathCheck:
 
@@ -60,6 +82,18 @@ class TestProtectedPathCheck:
         assert _is_under_protected_path(r"C:\Users\Conner\file.txt") is False
 
 
+class TestSuffix:
+
+    def test_suffix_semantics(self) -> None:
+        assert _suffix("Report.DOCX") == ".docx"
+        assert _suffix(".env") == ""
+        assert _suffix("file.") == ""
+
+    def test_suffix_is_the_interned_config_string(self) -> None:
+        member = next(e for e in DOCUMENT_EXTENSIONS if e == ".docx")
+        assert _suffix("Report.DOCX") is member
+
+
 class TestFileScanner:
 
     def test_scan_counts_files(self, db: Database, scan_tree) -> None:
@@ -94,6 +128,15 @@ class TestFileScanner:
         assert len(large) == 1
         assert large[0]["name"] == "large.bin"
 
+    def test_scan_flags_readonly_from_mode(self, db: Database, tmp_path) -> None:
+        locked = tmp_path / "locked.txt"
+        locked.write_text("x")
+        locked.chmod(0o444)
+        (tmp_path / "open.txt").write_text("x")
+        FileScanner(db).scan(str(tmp_path))
+        flags = {r["name"]: r["is_readonly"] for r in db.get_files()}
+        assert flags == {"locked.txt": 1, "open.txt": 0}
+
     def test_scan_populates_dir_sizes(self, db: Database, scan_tree) -> None:
         scanner = FileScanner(db)
         scanner.scan(str(scan_tree))
@@ -107,7 +150,49 @@ class TestFileScanner:
         # Should be called at least once
         assert len(calls) >= 1
 
+    def test_progress_reported_per_batch(self, db: Database, scan_tree, monkeypatch) -> None:
+        calls = []
+        FileScanner(db).scan(str(scan_tree), progress_callback=lambda s, e: calls.append(s))
+        assert calls == [5]  # one partial batch → one report
+        monkeypatch.setattr("drivemindr.scanner.SCANNER_BATCH_SIZE", 2)
+        calls.clear()
+        FileScanner(db).scan(str(scan_tree), progress_callback=lambda s, e: calls.append(s))
+        assert len(calls) > 1
+        assert calls == sorted(calls)
+
     def test_scan_id_unique(self, db: Database, scan_tree) -> None:
         s1 = FileScanner(db)
         s2 = FileScanner(db)
         assert s1.scan_id != s2.scan_id
+
+    def test_writer_failure_surfaces(self, db: Database, scan_tree, monkeypatch) -> None:
+        def _fail(records):
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr(db, "bulk_upsert_files", _fail)
+        scanner = FileScanner(db)
+        with pytest.raises(RuntimeError, match="disk full"):
+            scanner.scan(str(scan_tree))
+
+    def test_writer_failure_stops_walk(self, db: Database, scan_tree, monkeypatch) -> None:
+        def _fail(records):
+            raise RuntimeError("disk full")
+
+        def _await_failure(scanned: int, errors: int) -> None:
+            # Let the writer take the first batch before the walk goes on
+            deadline = time.monotonic() + 5
+            while scanner._writer_error is None and time.monotonic() < deadline:
+                time.sleep(0.001)
+
+        monkeypatch.setattr(db, "bulk_upsert_files", _fail)
+        monkeypatch.setattr("drivemindr.scanner.SCANNER_BATCH_SIZE", 1)
+        scanner = FileScanner(db)
+        with pytest.raises(RuntimeError, match="disk full"):
+            scanner.scan(str(scan_tree), progress_callback=_await_failure)
+        assert scanner._file_count < 5  # did not walk the whole tree
+
+    def test_scan_all_includes_app_count(self, db: Database, scan_tree) -> None:
+        scanner = FileScanner(db)
+        summary = scanner.scan_all(str(scan_tree))
+        assert summary["files"] == 5
+        assert summary["apps"] >= 0
@@ -1,6 +1,6 @@
 """Tests for utility helpers."""
 
-from drivemindr.utils import clamp, format_bytes, format_count
+from drivemindr.utils import clamp, format_bytes, format_count, timed
 
 
 class TestFormatBytes:
@@ -21,6 +21,14 @@ class TestFormatBytes:
     def test_terabytes(self) -> None:
         assert "TB" in format_bytes(1024 ** 4)
 
+    def test_petabytes_and_beyond(self) -> None:
+        assert format_bytes(1024 ** 5) == "1.00 PB"
+        assert format_bytes(1024 ** 6) == "1024.00 PB"
+
+    def test_unit_boundary(self) -> None:
+        assert format_bytes(1023) == "1023 B"
+        assert format_bytes(1536) == "1.50 KB"
+
     def test_negative(self) -> None:
         result = format_bytes(-1024)
         assert result.startswith("-")
@@ -35,6 +43,10 @@ class TestFormatCount:
     def test_thousands(self) -> None:
         assert format_count(1234567) == "1,234,567"
 
+    def test_zero_and_negative(self) -> None:
+        assert format_count(0) == "0"
+        assert format_count(-1234) == "-1,234"
+
 
 class TestClamp:
 
@@ -49,3 +61,22 @@ class TestClamp:
 
     def test_custom_bounds(self) -> None:
         assert clamp(15, low=0, high=10) == 10
+
+
+class TestTimed:
+
+    def test_returns_result_when_debug_disabled(self) -> None:
+        @timed("noop")
+        def add(a: int, b: int) -> int:
+            return a + b
+
+        assert add(2, 3) == 5
+
+    def test_logs_when_debug_enabled(self, caplog) -> None:
+        @timed("unit of work")
+        def work() -> str:
+            return "done"
+
+        with caplog.at_level("DEBUG", logger="drivemindr.timing"):
+            assert work() == "done"
+        assert "unit of work completed in" in caplog.text